@@ -0,0 +1,239 @@
+'''
+Benchmarks for the stages of the verification program
+
+Each stage of general_verification.py is timed on the files in the zeros and Lambda_Values folders
+and on synthetic lists of zeros that are larger than the shipped ones, for several values of N, τ and
+the working precision. The times are written to a JSON report, which can be compared with a report
+saved earlier to find stages that have become slower.
+
+Example:
+    python benchmark.py -o baseline.json
+    python benchmark.py -o report.json --baseline baseline.json --threshold 0.25
+'''
+import argparse, json, math, os, platform, sys, tempfile, time
+from mpmath import iv
+import general_verification as gv
+import lambda_values
+from lambda_values import read_lambda
+from prime_sieve import RiemannLambda
+from kronecker import DirichletLambda
+from tail_approximation import r, R, tail_bounds, tail_bounds_many
+
+RAMANUJAN_ZEROS = os.path.join("zeros", "Ramanujan_zeros.txt")
+DIRICHLET_ZEROS = os.path.join("zeros", "Dirichlet_Example_Zeros.txt")
+RAMANUJAN_LAMBDAS = os.path.join("Lambda_Values", "Ramanujan_Lambdas.txt")
+
+
+def synthetic_ordinates(count, start=14.0):
+    '''
+    Function to make an increasing list of ordinates spaced like the zeros of the zeta function,
+    with the gap at height t equal to 2π/log(t/2π)
+    '''
+    ordinates = []
+    t = start
+    for i in range(count):
+        ordinates.append(t)
+        t += 2 * math.pi / math.log(max(t / (2 * math.pi), 2))
+    return ordinates
+
+def synthetic_zeros(count):
+    '''
+    Function to make a list of zero intervals from synthetic_ordinates, padded like read_zeros
+    '''
+    error = iv.mpf("1e-8")
+    zeros = []
+    for t in synthetic_ordinates(count):
+        zero = iv.mpf(t)
+        zeros.append(iv.mpf([zero.a - error, zero.b + error]))
+    return zeros
+
+def write_hiary_file(file_name, count):
+    '''
+    Function to write synthetic ordinates in the format read by read_hiary_zeros, where the digits
+    after the first 6 decimal places are in a second column
+    '''
+    with open(file_name, "w") as file:
+        for t in synthetic_ordinates(count):
+            digits = format(t, ".10f")
+            file.write(digits[:-4] + " +" + digits[-4:] + "\n")
+
+
+def cases(quick, directory):
+    '''
+    Function to list the benchmarks
+
+    inputs:
+        quick - True to use fewer and smaller cases
+        directory - folder for the temporary files used by the cases
+
+    output: list of (name, stage, parameters, function) tuples, where function runs the case once
+    '''
+    precisions = [40] if quick else [20, 40]
+    terms = [1000, 10000] if quick else [1000, 10000, 99999]
+    taus = [100, 1000] if quick else [100, 1000, 10000]
+    sizes = [10000] if quick else [10000, 100000]
+    engines = ["mpmath", "numpy"] if gv.fast_sum.available() else ["mpmath"]
+    result = []
+    def add(stage, parameters, function):
+        name = stage + "[" + ",".join(key + "=" + str(value) for key, value in parameters.items()) + "]"
+        result.append((name, stage, parameters, function))
+
+    for dps in precisions:
+        add("read_zeros", {"file": "ramanujan", "dps": dps}, lambda: gv.read_zeros(RAMANUJAN_ZEROS, 0))
+        add("read_zeros", {"file": "dirichlet", "dps": dps}, lambda: gv.read_zeros(DIRICHLET_ZEROS, 1))
+        for size in sizes:
+            file_name = os.path.join(directory, "hiary-" + str(size) + ".txt")
+            write_hiary_file(file_name, size)
+            add("read_hiary_zeros", {"file": "synthetic", "zeros": size, "dps": dps}, lambda file_name=file_name, size=size: gv.read_hiary_zeros("0", file_name, size))
+
+    for dps in precisions:
+        for N in terms:
+            #the text path is timed without the cache, the table is read once outside the timing
+            def text(N=N):
+                directory = lambda_values.CACHE_DIR
+                lambda_values.CACHE_DIR = None
+                try:
+                    gv.von_mangoldt_term(N, "-1", "0", gv.Function.RAMANUJAN, RAMANUJAN_LAMBDAS)
+                finally:
+                    lambda_values.CACHE_DIR = directory
+            add("von_mangoldt_term", {"source": "ramanujan-file", "N": N, "dps": dps}, text)
+            table = {}
+            def cached(N=N, table=table):
+                if iv.prec not in table:
+                    table[iv.prec] = read_lambda(RAMANUJAN_LAMBDAS, N, False)
+                gv.von_mangoldt_term(N, "-1", "0", gv.Function.RAMANUJAN, table[iv.prec])
+            add("von_mangoldt_term", {"source": "ramanujan-table", "N": N, "dps": dps}, cached)
+            add("von_mangoldt_term", {"source": "riemann-sieve", "N": N, "dps": dps}, lambda N=N: gv.von_mangoldt_term(N, "-1", "30", gv.Function.RIEMANN, RiemannLambda()))
+            add("von_mangoldt_term", {"source": "dirichlet-sieve", "N": N, "dps": dps}, lambda N=N: gv.von_mangoldt_term(N, "-1", "0", gv.Function.REAL_DIRICHLET, DirichletLambda(-1159523)))
+
+    for dps in precisions:
+        #the remembered values are cleared so every run finds them again
+        def digamma(function, y, d):
+            gv._digamma_cache.clear()
+            gv.digamma_term("-1", y, function, d)
+        add("digamma_term", {"function": "riemann", "dps": dps}, lambda: digamma(gv.Function.RIEMANN, "30", None))
+        add("digamma_term", {"function": "dirichlet", "dps": dps}, lambda: digamma(gv.Function.REAL_DIRICHLET, "0", -1159523))
+        add("digamma_term", {"function": "ramanujan", "dps": dps}, lambda: digamma(gv.Function.RAMANUJAN, "0", None))
+
+    lists = {"ramanujan": (None, "0", gv.Function.RAMANUJAN)}
+    for size in sizes:
+        lists["synthetic-" + str(size)] = (size, "1000", gv.Function.RIEMANN)
+    for dps in precisions:
+        for name, (size, y, function) in lists.items():
+            zeros = {}
+            def window(tau, size=size, zeros=zeros, y=y):
+                #the zeros are made once for each precision outside the timing
+                if iv.prec not in zeros:
+                    zeros[iv.prec] = synthetic_zeros(size) if size != None else gv.read_zeros(RAMANUJAN_ZEROS, 0)
+                return gv.zero_window(zeros[iv.prec], y, str(tau))
+            for tau in taus:
+                for engine in engines:
+                    add("sum_over", {"zeros": name, "tau": tau, "engine": engine, "dps": dps}, lambda window=window, tau=tau, engine=engine, y=y, function=function: gv.sum_over(window(tau), "-1", y, function, engine))
+
+    for dps in precisions:
+        for tau in taus:
+            add("tail_bounds", {"bound": "R", "tau": tau, "dps": dps}, lambda tau=tau: R("-1", "1000", str(tau)))
+            add("tail_bounds", {"bound": "r", "tau": tau, "dps": dps}, lambda tau=tau: r("-1", "1000", str(tau)))
+            add("tail_bounds", {"bound": "both", "tau": tau, "dps": dps}, lambda tau=tau: tail_bounds("-1", "1000", str(tau)))
+        #a sweep over heights and τ, as found by scan_completeness and verify_taus
+        points = [("-1", str(y), str(tau)) for y in range(1000, 2000, 10) for tau in taus]
+        add("tail_bounds", {"bound": "separate", "points": len(points), "dps": dps}, lambda points=points: [(r(*point), R(*point)) for point in points])
+        add("tail_bounds", {"bound": "many", "points": len(points), "dps": dps}, lambda points=points: tail_bounds_many(points))
+
+    for N in terms:
+        for tau in taus:
+            zeros = {}
+            def verify(N=N, tau=tau, zeros=zeros):
+                if iv.prec not in zeros:
+                    zeros[iv.prec] = gv.read_zeros(RAMANUJAN_ZEROS, 0)
+                gv._digamma_cache.clear()
+                gv.verify(zeros[iv.prec], "-10", "0", N, str(tau), gv.Function.RAMANUJAN, read_lambda(RAMANUJAN_LAMBDAS, N, False), gv.Verification.RIEMANN_HYPOTHESIS)
+            add("verify", {"function": "ramanujan", "N": N, "tau": tau, "dps": 40}, verify)
+    return result
+
+
+def run_case(function, dps, repeat):
+    '''
+    Function to time a case, running it once first so that data made on the first call is not timed
+
+    output: the shortest time in seconds and the error raised by the case, or None
+    '''
+    start = iv.dps
+    iv.dps = dps
+    try:
+        function()
+        times = []
+        for i in range(repeat):
+            begin = time.perf_counter()
+            function()
+            times.append(time.perf_counter() - begin)
+        return min(times), None
+    except (Exception, SystemExit) as error:
+        return None, type(error).__name__ + ": " + str(error)
+    finally:
+        iv.dps = start
+
+def compare(results, baseline, threshold, thresholds):
+    '''
+    Function to compare a report with a baseline
+
+    inputs:
+        results, baseline - lists of results from two reports
+        threshold - allowed relative slowdown, 0.25 allows a case to take 25% longer
+        thresholds - dictionary from stage to the allowed slowdown for that stage
+
+    output: list of the names of the cases that became slower than allowed
+    '''
+    previous = {result["name"]: result for result in baseline}
+    regressions = []
+    for result in results:
+        old = previous.get(result["name"])
+        if old == None or old["seconds"] == None or result["seconds"] == None:
+            continue
+        allowed = thresholds.get(result["stage"], threshold)
+        change = result["seconds"] / old["seconds"] - 1
+        status = ""
+        if change > allowed:
+            status = "  REGRESSION"
+            regressions.append(result["name"])
+        print(result["name"] + ": " + format(result["seconds"], ".4f") + "s, baseline " + format(old["seconds"], ".4f") + "s, " + format(change, "+.0%") + status)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Program to time the stages of the verification program and compare the times with a saved report.")
+    parser.add_argument("-o", "--output", default="benchmark.json", help="file for the JSON report, default is benchmark.json")
+    parser.add_argument("--baseline", help="JSON report from an earlier run to compare with", metavar="FILENAME")
+    parser.add_argument("--threshold", type=float, default=0.25, help="relative slowdown reported as a regression, default is 0.25")
+    parser.add_argument("--stage_threshold", nargs=2, action="append", default=[], help="relative slowdown allowed for one stage, can be given many times", metavar=("STAGE", "THRESHOLD"))
+    parser.add_argument("--repeat", type=int, default=3, help="number of timed runs of each case, the shortest is reported")
+    parser.add_argument("--quick", action="store_true", help="use fewer and smaller cases")
+    parser.add_argument("--only", help="only run the cases with this text in their name", metavar="TEXT")
+    args = parser.parse_args()
+    output = os.path.abspath(args.output)
+    baseline_file = os.path.abspath(args.baseline) if args.baseline != None else None
+    #the shipped files are found relative to this file
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    thresholds = {stage: float(value) for stage, value in args.stage_threshold}
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for name, stage, parameters, function in cases(args.quick, directory):
+            if args.only != None and args.only not in name:
+                continue
+            seconds, error = run_case(function, parameters.get("dps", 40), args.repeat)
+            results.append({"name": name, "stage": stage, "parameters": parameters, "seconds": seconds, "error": error})
+            if error == None:
+                print(name + ": " + format(seconds, ".4f") + "s", flush=True)
+            else:
+                print(name + ": " + error, flush=True)
+    report = {"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(), "quick": args.quick, "repeat": args.repeat, "results": results}
+    with open(output, "w") as file:
+        json.dump(report, file, indent=1)
+    if baseline_file != None:
+        with open(baseline_file) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline["results"], args.threshold, thresholds)
+        if len(regressions) > 0:
+            sys.exit(str(len(regressions)) + " cases became slower than allowed: " + ", ".join(regressions))
+if __name__ == "__main__":
+    main()
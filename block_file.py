@@ -0,0 +1,238 @@
+'''
+Seekable block-compressed text files for zeros and Lambda values
+
+The lines of a text file are split into blocks of BLOCK_LINES lines, and each block is compressed
+on its own with gzip or, when the zstandard module is installed, zstd. An index at the end of the
+file records where each block starts, the number of its first line and, for files of zeros, the
+ordinate on its first line. A reader can then seek to the block holding a given line or ordinate and
+decompress only that block, streaming the following blocks as they are needed.
+
+The readers in general_verification.py, lambda_values.py, zero_store.py and zero_index.py open files
+with open_text, which accepts both plain text files and block files, so a compressed copy can be used
+anywhere a text file was used before. Files are converted with
+    python block_file.py INPUT OUTPUT [--codec gzip|zstd] [--column COLUMN | --hiary]
+'''
+import argparse, bisect, gzip, io, math, struct, sys
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MAGIC = b"ZBLOCKS1"
+HEADER = struct.Struct("<8sQq")     #codec, lines in each block and column of the ordinates
+FOOTER = struct.Struct("<QQ")       #position of the index and number of blocks
+ENTRY = struct.Struct("<QQQd")      #position and size of a block, number of its first line and its first ordinate
+BLOCK_LINES = 4096
+NO_ORDINATES = -1
+HIARY = -2      #column value for the format found on Dr. Ghaith Hiary's webpage
+
+
+def is_block_file(file_name):
+    '''
+    Function to check whether a file was written by write_blocks
+    '''
+    with open(file_name, "rb") as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+def _compress(data, codec):
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=19).compress(data)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+def _decompress(data, codec):
+    if codec == "zstd":
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+def _first_ordinate(line, column):
+    '''
+    Internal function to find the ordinate on a line as a float rounded down, nan if there is none
+    '''
+    words = line.split()
+    if column == HIARY and len(words) > 1:
+        word = words[0] + words[1][1:]
+    elif column >= 0 and len(words) > column:
+        word = words[column]
+    else:
+        return math.nan
+    return math.nextafter(float(word), -math.inf)
+
+def write_blocks(input_name, output, codec="gzip", column=NO_ORDINATES, block_lines=BLOCK_LINES):
+    '''
+    Function to convert a text file into a block file
+
+    inputs:
+        input_name - name of the text file
+        output - name of the block file to create
+        codec - "gzip" or "zstd"
+        column - column of the ordinates for files of zeros, HIARY for Hiary's format, or NO_ORDINATES
+        block_lines - number of lines in each block
+
+    output: number of blocks written
+    '''
+    if codec == "zstd" and zstandard == None:
+        sys.exit("The zstandard module could not be imported, please try again with gzip.")
+    entries = []
+    with open(input_name, "rb") as source, open(output, "wb") as file:
+        file.write(MAGIC + HEADER.pack(codec.encode(), block_lines, column))
+        number = 0
+        while True:
+            lines = [line for line in (source.readline() for i in range(block_lines)) if line != b""]
+            if len(lines) == 0:
+                break
+            ordinate = math.nan
+            if column != NO_ORDINATES:
+                #the first line holding an ordinate is used, blank lines are skipped
+                for line in lines:
+                    ordinate = _first_ordinate(line, column)
+                    if not math.isnan(ordinate):
+                        break
+            data = _compress(b"".join(lines), codec)
+            entries.append((file.tell(), len(data), number, ordinate))
+            file.write(data)
+            number += len(lines)
+        position = file.tell()
+        for entry in entries:
+            file.write(ENTRY.pack(*entry))
+        file.write(FOOTER.pack(position, len(entries)))
+    return len(entries)
+
+
+class BlockFile:
+    '''
+    Reader for a file written by write_blocks, which can be used with with
+
+        codec, block_lines, column: values given to write_blocks
+        entries: list of (position, size, first line, first ordinate) for every block
+    '''
+    def __init__(self, file_name):
+        self.file = open(file_name, "rb")
+        if self.file.read(len(MAGIC)) != MAGIC:
+            sys.exit("File is not a block file, please try again.")
+        codec, self.block_lines, self.column = HEADER.unpack(self.file.read(HEADER.size))
+        self.codec = codec.rstrip(b"\0").decode()
+        if self.codec == "zstd" and zstandard == None:
+            sys.exit("The zstandard module is needed to read " + file_name + ", please install it and try again.")
+        self.file.seek(-FOOTER.size, io.SEEK_END)
+        position, count = FOOTER.unpack(self.file.read(FOOTER.size))
+        self.file.seek(position)
+        data = self.file.read(count * ENTRY.size)
+        self.entries = [ENTRY.unpack_from(data, i * ENTRY.size) for i in range(count)]
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *error):
+        self.close()
+
+    def block(self, i):
+        '''
+        Function to decompress a single block
+
+        output: list of the lines of the block as bytes
+        '''
+        position, size, first, ordinate = self.entries[i]
+        self.file.seek(position)
+        return _decompress(self.file.read(size), self.codec).splitlines(keepends=True)
+
+    def lines(self, start=0):
+        '''
+        Generator yielding the lines of the file as bytes, starting at the block with the given number
+        '''
+        for i in range(start, len(self.entries)):
+            yield from self.block(i)
+
+    def lines_from(self, number):
+        '''
+        Generator yielding the lines of the file as bytes, starting at the line with the given number,
+        counted from 0, only the block holding that line and the ones after it are decompressed
+        '''
+        if len(self.entries) == 0:
+            return
+        i = self.find_line(number)
+        lines = self.block(i)
+        yield from lines[number - self.entries[i][2]:]
+        yield from self.lines(i + 1)
+
+    def find_line(self, number):
+        '''
+        Function to find the block holding a line
+
+        output: number of the block
+        '''
+        return max(bisect.bisect_right([entry[2] for entry in self.entries], number) - 1, 0)
+
+    def find_ordinate(self, value):
+        '''
+        Function to find the last block that starts below a value, for files of zeros
+
+        output: number of the block
+        '''
+        if self.column == NO_ORDINATES:
+            sys.exit("The block file has no ordinates in its index, please convert it again with --column or --hiary.")
+        ordinates = [entry[3] for entry in self.entries]
+        return max(bisect.bisect_left(ordinates, value) - 1, 0)
+
+
+class TextLines:
+    '''
+    Text file interface to a block file, supporting iteration over the lines, readline and with
+
+        start: number of the first line to read, counted from 0
+    '''
+    def __init__(self, file_name, start=0):
+        self.blocks = BlockFile(file_name)
+        self.stream = self.blocks.lines_from(start)
+
+    def __iter__(self):
+        for line in self.stream:
+            yield line.decode()
+
+    def readline(self):
+        return next(self.stream, b"").decode()
+
+    def close(self):
+        self.blocks.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *error):
+        self.close()
+
+def open_text(file_name, start=0):
+    '''
+    Function to open a plain text file or a block file for reading lines of text
+
+        start: number of the first line to read, counted from 0, a block file seeks to the block
+            holding it while the lines before it are skipped in a plain file
+    '''
+    if is_block_file(file_name):
+        return TextLines(file_name, start)
+    file = open(file_name)
+    for i in range(start):
+        file.readline()
+    return file
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Program to convert a text file of zeros or Lambda values into a block-compressed file that can be read in place of the text file")
+    parser.add_argument("input", help="text file to convert")
+    parser.add_argument("output", help="name of the block file to create")
+    parser.add_argument("--codec", choices=["gzip", "zstd"], default="gzip", help="compression used for each block, zstd needs the zstandard module")
+    parser.add_argument("--column", type=int, help="column of the zero ordinates, which are saved in the index so the blocks around a height can be found")
+    parser.add_argument("--hiary", action="store_true", help="the file uses the format found on Dr. Ghaith Hiary's webpage")
+    parser.add_argument("--lines", type=int, default=BLOCK_LINES, help="number of lines in each block, default is " + str(BLOCK_LINES))
+    args = parser.parse_args()
+    column = NO_ORDINATES
+    if args.hiary:
+        column = HIARY
+    elif args.column != None:
+        column = args.column
+    count = write_blocks(args.input, args.output, args.codec, column, args.lines)
+    print("Wrote", count, "blocks to", args.output)
+if __name__ == "__main__":
+    main()
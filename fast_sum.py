@@ -0,0 +1,135 @@
+'''
+Vectorized version of sum_over using NumPy
+
+Every zero interval is stored as a pair of 64-bit floats and the contribution of all zeros in
+a window is computed with array operations. Each floating point operation is correctly rounded
+to the nearest float, so moving its result one float outwards with nextafter gives a rigorous
+bound. The final sums are computed exactly rounded with math.fsum and widened the same way,
+so the result is an interval containing the true contribution of the zeros.
+'''
+import math
+from mpmath import iv
+from mpmath.libmp import to_float, round_floor, round_ceiling
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def available():
+    '''
+    Returns True if NumPy could be imported and the fast engine can be used
+    '''
+    return np is not None
+
+
+def _down(value):
+    return np.nextafter(value, -np.inf)
+
+def _up(value):
+    return np.nextafter(value, np.inf)
+
+def float_bounds(value):
+    '''
+    Function to round an interval outwards to a pair of floats
+    '''
+    value = iv.mpf(value)
+    lower, upper = value._mpi_
+    return to_float(lower, rnd=round_floor), to_float(upper, rnd=round_ceiling)
+
+def endpoint_arrays(zeros):
+    '''
+    Function to find arrays of lower and upper endpoints for a set of zeros
+
+    input: list of intervals, or a view from zero_store which already holds the endpoints as floats
+
+    output: lower endpoints, upper endpoints and the interval that has to be added to both
+    '''
+    if hasattr(zeros, "offset"):
+        return np.asarray(zeros.lower, dtype=np.float64), np.asarray(zeros.upper, dtype=np.float64), zeros.offset
+    bounds = [float_bounds(zero) for zero in zeros]
+    lower = np.array([bound[0] for bound in bounds], dtype=np.float64)
+    upper = np.array([bound[1] for bound in bounds], dtype=np.float64)
+    return lower, upper, iv.mpf("0")
+
+
+def _square(lower, upper):
+    '''
+    Internal function to find outward rounded bounds on the squares of an array of intervals
+    '''
+    low = np.minimum(lower * lower, upper * upper)
+    high = np.maximum(lower * lower, upper * upper)
+    #intervals containing zero have a square with lower bound zero
+    low = np.where((lower <= 0) & (upper >= 0), 0.0, _down(low))
+    return np.maximum(low, 0.0), _up(high)
+
+def _sum_bounds(lower, upper):
+    '''
+    Internal function to add up arrays of lower and upper bounds into an interval
+    '''
+    total_lower = math.nextafter(math.fsum(lower.tolist()), -math.inf)
+    total_upper = math.nextafter(math.fsum(upper.tolist()), math.inf)
+    return iv.mpf([total_lower, total_upper])
+
+def term_bounds(lower, upper, num, base_square, shift):
+    '''
+    Function to find bounds on num/[base_square + (gamma - shift)^2] for every zero gamma
+
+    inputs:
+        lower, upper - arrays of endpoints of the zeros
+        num - pair of floats bounding the numerator, which must be positive
+        base_square - pair of floats bounding the constant part of the denominator
+        shift - pair of floats bounding the value subtracted from each zero
+
+    output: arrays of lower and upper bounds on each term
+    '''
+    diff_lower = _down(lower - shift[1])
+    diff_upper = _up(upper - shift[0])
+    square_lower, square_upper = _square(diff_lower, diff_upper)
+    den_lower = _down(square_lower + base_square[0])
+    den_upper = _up(square_upper + base_square[1])
+    return _down(num[0] / den_upper), _up(num[1] / den_lower)
+
+
+def riemann_terms(zeros, x, y):
+    '''
+    Function to find bounds on the contribution of each zero for the Riemann zeta function
+
+    Each zero contributes (1/2 - x)/[(1/2 - x)^2 + (gamma - y)^2]
+    '''
+    lower, upper, offset = endpoint_arrays(zeros)
+    num = iv.mpf("1/2") - iv.mpf(x)
+    shift = iv.mpf(y) - offset
+    return term_bounds(lower, upper, float_bounds(num), float_bounds(num ** 2), float_bounds(shift))
+
+def general_terms(zeros, x):
+    '''
+    Function to find bounds on the contribution of each zero for the other L-functions,
+    which are expanded around a real point
+
+    Each zero contributes (1 - 2x)/[(1/2 - x)^2 + gamma^2], except for zeros at the origin
+    which contribute 1/(1/2 - x)
+    '''
+    lower, upper, offset = endpoint_arrays(zeros)
+    beta = iv.mpf("1/2") - iv.mpf(x)
+    num = iv.mpf("1") - (iv.mpf("2") * iv.mpf(x))
+    term_lower, term_upper = term_bounds(lower, upper, float_bounds(num), float_bounds(beta ** 2), float_bounds(-offset))
+    if offset == iv.mpf("0"):
+        origin = (lower == 0) & (upper == 0)
+        origin_lower, origin_upper = float_bounds(beta / (beta ** 2))
+        term_lower = np.where(origin, origin_lower, term_lower)
+        term_upper = np.where(origin, origin_upper, term_upper)
+    return term_lower, term_upper
+
+
+def riemann_sum(zeros, x, y):
+    '''
+    Fast version of sum_over for the Riemann zeta function
+    '''
+    return _sum_bounds(*riemann_terms(zeros, x, y))
+
+def general_sum(zeros, x):
+    '''
+    Fast version of sum_over for the other L-functions
+    '''
+    return _sum_bounds(*general_terms(zeros, x))
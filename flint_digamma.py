@@ -0,0 +1,182 @@
+'''
+In-process evaluation of the digamma values used in general_verification.py
+
+This calls arb_digamma and acb_digamma from the FLINT library through ctypes, doing the same
+calculations as riemann_digamma.c and general_digamma.c without starting a new process for every
+value. The ball endpoints are read back as exact binary numbers instead of being printed and parsed.
+'''
+import ctypes, ctypes.util, os, sys
+from mpmath import iv
+from mpmath.libmp import from_man_exp
+
+PREC = 100      #working precision in bits, matches the compiled C programs
+ARB_SIZE = 48   #sizeof(arb_struct) on 64-bit platforms, an arf_struct followed by a mag_struct
+ACB_SIZE = 2 * ARB_SIZE
+
+#which engine digamma_term should use, one of "auto", "flint" or "subprocess"
+ENGINE = "auto"
+
+_library = None
+_loaded = False
+
+
+def _load_library():
+    '''
+    Internal function to find and load the shared FLINT library, returns None if it is not available
+
+    The location of the library can be given directly with the FLINT_LIBRARY environment variable.
+    Older installations keep arb in a separate library, so that name is also tried.
+    '''
+    global _library, _loaded
+    if _loaded:
+        return _library
+    _loaded = True
+    names = [os.environ.get("FLINT_LIBRARY"), ctypes.util.find_library("flint"), ctypes.util.find_library("arb")]
+    for name in names:
+        if name is None:
+            continue
+        try:
+            lib = ctypes.CDLL(name)
+            #make sure the functions we need are exported by this library
+            for symbol in ["arb_digamma", "acb_digamma", "arb_is_finite", "arb_get_interval_fmpz_2exp", "fmpz_get_str", "flint_free"]:
+                getattr(lib, symbol)
+        except (OSError, AttributeError):
+            continue
+        lib.arb_set_str.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_long]
+        lib.arb_set_str.restype = ctypes.c_int
+        lib.fmpz_get_str.argtypes = [ctypes.c_char_p, ctypes.c_int, ctypes.c_void_p]
+        lib.fmpz_get_str.restype = ctypes.c_void_p
+        lib.flint_free.argtypes = [ctypes.c_void_p]
+        lib.arb_is_finite.argtypes = [ctypes.c_void_p]
+        lib.arb_is_finite.restype = ctypes.c_int
+        lib.arb_get_interval_fmpz_2exp.argtypes = [ctypes.c_void_p] * 4
+        for symbol in ["arb_init", "arb_clear", "acb_init", "acb_clear", "fmpz_clear"]:
+            getattr(lib, symbol).argtypes = [ctypes.c_void_p]
+        lib.acb_set_arb_arb.argtypes = [ctypes.c_void_p] * 3
+        for symbol in ["arb_sub", "arb_add", "arb_div", "arb_digamma", "acb_sub_arb", "acb_div_arb", "acb_digamma"]:
+            getattr(lib, symbol).argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_long]
+        _library = lib
+        break
+    return _library
+
+def available():
+    '''
+    Returns True if the FLINT library could be loaded and the in-process engine can be used
+    '''
+    return _load_library() is not None
+
+
+def _fmpz_to_int(lib, f):
+    '''
+    Internal function to turn an fmpz into a Python integer without losing any bits
+    '''
+    pointer = lib.fmpz_get_str(None, 16, ctypes.byref(f))
+    text = ctypes.string_at(pointer).decode()
+    lib.flint_free(pointer)
+    return int(text, 16)
+
+def _arb_to_interval(lib, x):
+    '''
+    Internal function to turn an arb ball into an mpmath interval
+
+    The endpoints of the ball are computed exactly by FLINT as integers times a power of 2,
+    mpmath then rounds them outwards to the current working precision.
+    '''
+    if not lib.arb_is_finite(x):
+        return iv.mpf(["-inf", "inf"])
+    a = ctypes.c_long(0)
+    b = ctypes.c_long(0)
+    exp = ctypes.c_long(0)
+    lib.arb_get_interval_fmpz_2exp(ctypes.byref(a), ctypes.byref(b), ctypes.byref(exp), x)
+    lower = _fmpz_to_int(lib, a)
+    upper = _fmpz_to_int(lib, b)
+    shift = _fmpz_to_int(lib, exp)
+    for f in [a, b, exp]:
+        lib.fmpz_clear(ctypes.byref(f))
+    return iv.mpf([from_man_exp(lower, shift), from_man_exp(upper, shift)])
+
+
+def _set_str(lib, value, text):
+    '''
+    Internal function to set an arb from a decimal string, arb_set_str leaves the ball unchanged when
+    the string cannot be parsed
+    '''
+    if lib.arb_set_str(value, text.encode(), PREC) != 0:
+        sys.exit("FLINT could not read the value " + text + ", please try again.")
+
+def _riemann_digamma(lib, x, y):
+    '''
+    Internal function matching riemann_digamma.c, returns Digamma((z - 3)/(-2)) for z = x + iy
+    '''
+    real = ctypes.create_string_buffer(ARB_SIZE)
+    imag = ctypes.create_string_buffer(ARB_SIZE)
+    three = ctypes.create_string_buffer(ARB_SIZE)
+    two = ctypes.create_string_buffer(ARB_SIZE)
+    z = ctypes.create_string_buffer(ACB_SIZE)
+    res = ctypes.create_string_buffer(ACB_SIZE)
+    for val in [real, imag, three, two]:
+        lib.arb_init(val)
+    for val in [z, res]:
+        lib.acb_init(val)
+    _set_str(lib, real, x)
+    _set_str(lib, imag, y)
+    _set_str(lib, three, "3")
+    _set_str(lib, two, "-2")
+    lib.acb_set_arb_arb(z, real, imag)
+    lib.acb_sub_arb(z, z, three, PREC)
+    lib.acb_div_arb(z, z, two, PREC)
+    lib.acb_digamma(res, z, PREC)
+    #the real and imaginary parts of an acb are stored one after the other
+    address = ctypes.addressof(res)
+    value = iv.mpc(_arb_to_interval(lib, address), _arb_to_interval(lib, address + ARB_SIZE))
+    for val in [real, imag, three, two]:
+        lib.arb_clear(val)
+    for val in [z, res]:
+        lib.acb_clear(val)
+    return value
+
+def _general_digamma(lib, x, m):
+    '''
+    Internal function matching general_digamma.c, returns Digamma((1 - x + m)/2)
+    '''
+    d = ctypes.create_string_buffer(ARB_SIZE)
+    shift = ctypes.create_string_buffer(ARB_SIZE)
+    one = ctypes.create_string_buffer(ARB_SIZE)
+    two = ctypes.create_string_buffer(ARB_SIZE)
+    res = ctypes.create_string_buffer(ARB_SIZE)
+    for val in [d, shift, one, two, res]:
+        lib.arb_init(val)
+    _set_str(lib, d, x)
+    _set_str(lib, shift, m)
+    _set_str(lib, one, "1")
+    _set_str(lib, two, "2")
+    lib.arb_sub(res, one, d, PREC)
+    lib.arb_add(res, res, shift, PREC)
+    lib.arb_div(res, res, two, PREC)
+    lib.arb_digamma(res, res, PREC)
+    value = _arb_to_interval(lib, res)
+    for val in [d, shift, one, two, res]:
+        lib.arb_clear(val)
+    return value
+
+
+def digamma_batch(inputs):
+    '''
+    Function to evaluate many digamma values without leaving the current process
+
+    input: list of (x, y, m) tuples of strings. When m is None the value from riemann_digamma.c
+        is computed for z = x + iy, otherwise the value from general_digamma.c is computed using
+        x and m, and y is ignored
+
+    output: list of intervals in the same order as the inputs, complex intervals for the Riemann values
+    '''
+    lib = _load_library()
+    if lib is None:
+        raise OSError("The FLINT library could not be loaded")
+    values = []
+    for x, y, m in inputs:
+        if m is None:
+            values.append(_riemann_digamma(lib, str(x), str(y)))
+        else:
+            values.append(_general_digamma(lib, str(x), str(m)))
+    return values
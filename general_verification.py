@@ -1,7 +1,23 @@
-import subprocess, bisect, sys, argparse
+import subprocess, bisect, os, sys, argparse, csv, json, math, multiprocessing
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from decimal import Decimal
+from fractions import Fraction
 from mpmath import iv, nprint, nstr
 from enum import Enum
-from tail_approximation import r, R
+from tail_approximation import tail_bounds_many, general_tail_bounds_many
+import flint_digamma
+from zero_store import ZeroStore, ZeroView, read_zero_list, read_hiary_zero_list
+import fast_sum
+import block_file
+import lambda_values
+import profiling
+import sum_cache
+import zero_index
+from lambda_values import LambdaTable, read_lambda
+from prime_sieve import RiemannLambda
+from ramanujan_tau import RamanujanLambda
+from kronecker import DirichletLambda, PrimeLogTable
 
 
 class Function(Enum):
@@ -31,7 +47,7 @@ def read_hiary_zeros(start, file_name, lines):
         lines: number of lines to read, creating intervals can take a while, so this option
             allows the user to only read in a subset of lines without modifying the file
     '''
-    file = open(file_name)      #open the text file
+    file = block_file.open_text(file_name)      #open the text file
     zeros = []                 #create an empty list to hold the zeros
     start = iv.mpf(start)       #create an interval with the starting value
     error = iv.mpf("1e-10")     #create an interval with the error bounds, taken from Dr. Hiary's webpage
@@ -55,7 +71,7 @@ def read_zeros(file_name, index):
     
     output: list containing those zeros
     '''
-    file = open(file_name)      #open the text file
+    file = block_file.open_text(file_name)      #open the text file
     zeros = []                 #create an empty list to hold the zeros
     error = iv.mpf("1e-8")
     for line in file:           #loop through the lines of the file
@@ -66,6 +82,28 @@ def read_zeros(file_name, index):
         zeros.append(zero)   #add the interval to the list
     return zeros  
 
+def read_conductor_zeros(file_name):
+    '''
+    Function to read a file of zeros for many real Dirichlet characters, in the format of
+    zeros/Dirichlet_Example_Zeros.txt with the conductor in the first column and the zero in the second
+
+    output: dictionary from each conductor to a sorted list of its zeros
+    '''
+    zeros = {}
+    error = iv.mpf("1e-8")
+    with block_file.open_text(file_name) as file:
+        for line in file:
+            words = line.split()
+            if len(words) < 2:
+                continue
+            zero = iv.mpf(words[1])
+            if zero != iv.mpf("0"):
+                zero = iv.mpf([zero.a - error, zero.b + error])
+            zeros.setdefault(int(words[0]), []).append(zero)
+    for d in zeros:
+        zeros[d].sort(key=lambda zero: zero.a)
+    return zeros
+
 def find_closest_index(zeros, y):
     '''
     Internal function to find the starting index in a list of zeros
@@ -97,6 +135,45 @@ def find_closest_index(zeros, y):
         return [index - 1, left_val]
 
 
+def zero_window(zeros, y, Tau):
+    '''
+    Internal function to find the zeros with imaginary part in the range [y - τ, y + τ]
+
+    inputs:
+        zeros - list of zeros, or a ZeroStore which only creates intervals for the zeros in the window
+        y - imaginary part of the expansion point
+        Tau - half the width of the window
+
+    output: list of intervals containing the zeros in the window
+    '''
+    upper_val = iv.mpf(y) + iv.mpf(Tau)
+    lower_val = iv.mpf(y) - iv.mpf(Tau)
+    if hasattr(zeros, "window"):
+        return zeros.window(lower_val, upper_val)
+    first = find_closest_index(zeros, lower_val)
+    last = find_closest_index(zeros, upper_val)
+    if first[0] == 0 and first[1] > lower_val:
+        return zeros[:last[0] + 1]
+    return zeros[first[0] + 1:last[0] + 1]
+
+
+def load_lambda(file_name, N, function):
+    '''
+    Internal function to read the Lambda values for a function into a LambdaTable, using the
+    cache in lambda_values unless it has been turned off
+    '''
+    exponential = function.value == Function.RIEMANN.value
+    if lambda_values.CACHE_DIR == None:
+        return read_lambda(file_name, N, exponential)
+    return lambda_values.cached_lambda(file_name, N, exponential)
+
+def check_terms(N, input):
+    '''
+    Internal function to exit with a message when a LambdaTable has fewer than N values
+    '''
+    if isinstance(input, LambdaTable) and input.limit < N:
+        sys.exit("The Lambda values only go up to n = " + str(input.limit) + ", please try again with N <= " + str(input.limit) + ".")
+
 def von_mangoldt_term(N, x, y, function, input):
     '''
     Internal function to calculate the part of the sum involving the Von Mangoldt function
@@ -104,20 +181,31 @@ def von_mangoldt_term(N, x, y, function, input):
         x - string, real part of the expansion point
         y - string, imaginary part of the expansion point
         function - enum for the type of function being evaluated
-        file name - name of a file containing e^Lambda(n) or Lambda(n)
+        input - name of a file containing e^Lambda(n) or Lambda(n), a LambdaTable holding the
+            values of Lambda(n), a RiemannLambda, RamanujanLambda or DirichletLambda which generates
+            them, or a list
+            containing the value of this term and its error
     
     output: interval containing this portion of the sum using N terms for the sum involving the
     Von Mangoldt function
 
-        TODO - handle case where N is greater than available VM terms
+    Exits if the file or table holds fewer than N values.
     '''
+    #use the table cached on disk for this file unless the cache has been turned off
+    if isinstance(input, str) and lambda_values.CACHE_DIR != None:
+        input = load_lambda(input, N, function)
+    check_terms(N, input)
     if (isinstance(input, str)):
-        file = open(input)  #open file
+        file = block_file.open_text(input)  #open file
         sum = iv.mpc("0")       #initiate sum
+        nonzero = 0
         if function.value == Function.RIEMANN.value: 
             for i in range(N):      #for loop determines how many terms will be used
                 line = file.readline()      #read a line from the file
+                if line.strip() == "":
+                    sys.exit("The Lambda file only has " + str(i) + " values, please try again with N <= " + str(i) + ".")
                 if line.strip() != "1":     #if line does not equal 1, meaning log(line) != 0
+                    nonzero += 1
                     sum += (iv.log(iv.mpf(line.strip())) / (iv.mpf(i + 1) ** (iv.mpc("1", "0") - iv.mpc(x, y))))    #use the line to calculate the next term and add it to the sum
             sum = (iv.mpc("-1","0") * sum) - (iv.mpc("1","0") / iv.mpc(x, y)) #multiply sum by -1 and subtract 1/z
         elif function.value >= Function.RIEMANN.value:    #for functions other than zeta
@@ -127,11 +215,37 @@ def von_mangoldt_term(N, x, y, function, input):
             #same as Riemann case, loop through the file
             for i in range(1, N + 1):
                 line = file.readline()  #read a line from the file
+                if line.strip() == "":
+                    sys.exit("The Lambda file only has " + str(i - 1) + " values, please try again with N <= " + str(i - 1) + ".")
                 #if the line is not zero, calculate the next term and add it to the sum
                 if line.strip() != "0":
+                    nonzero += 1
                     sum += iv.mpf(line.strip())/(iv.mpf(i) ** (iv.mpf("1") - iv.mpf(x)))
             #multiply the sum by -1
             sum = iv.mpf("-1") * sum
+        profiling.count("lambda_terms_read", N)
+        profiling.count("lambda_terms_nonzero", nonzero)
+        return sum
+    elif hasattr(input, "terms"):
+        if function.value == Function.RIEMANN.value:
+            sum = iv.mpc("0")       #initiate sum
+            exponent = iv.mpc("1", "0") - iv.mpc(x, y)
+            nonzero = 0
+            for nonzero, (n, value) in enumerate(input.terms(N), 1):
+                sum += value / (iv.mpf(n) ** exponent)
+            sum = (iv.mpc("-1","0") * sum) - (iv.mpc("1","0") / iv.mpc(x, y)) #multiply sum by -1 and subtract 1/z
+        else:
+            #ensure a real expansion point is being used
+            if y != "0":
+                sys.exit("Invalid expansion point. Please choose a point on the real line and try again.")
+            sum = iv.mpf("0")
+            exponent = iv.mpf("1") - iv.mpf(x)
+            nonzero = 0
+            for nonzero, (n, value) in enumerate(input.terms(N), 1):
+                sum += value / (iv.mpf(n) ** exponent)
+            sum = iv.mpf("-1") * sum
+        profiling.count("lambda_terms_read", N)
+        profiling.count("lambda_terms_nonzero", nonzero)
         return sum
     elif (isinstance(input, list)):
         value = iv.mpf(input[0])
@@ -142,6 +256,56 @@ def von_mangoldt_term(N, x, y, function, input):
         sys.exit("Invalid input, please try again.")
 
 
+def von_mangoldt_terms(N, points, function, input):
+    '''
+    Internal function to calculate the part of the sum involving the Von Mangoldt function at many
+    expansion points with a single pass over the Lambda values
+
+    inputs:
+        points - list of (x, y) tuples of strings giving the expansion points
+        input - same as von_mangoldt_term, except that a list holding a precomputed value is not allowed
+
+    output: list of intervals, one for each point in the same order, equal to what von_mangoldt_term
+    gives for that point
+
+    Each term is Λ(n) n^(x - 1) e^(iy log n), so log n is found once for every n and the real
+    exponential is found once for every distinct x and the rotation once for every distinct y,
+    which makes a grid of points cost about as much as its rows and columns instead of its points.
+    '''
+    if isinstance(input, str):
+        input = load_lambda(input, N, function)
+    if not hasattr(input, "terms"):
+        sys.exit("Invalid input, please try again.")
+    check_terms(N, input)
+    riemann = function.value == Function.RIEMANN.value
+    if not riemann:
+        #ensure real expansion points are being used
+        for x, y in points:
+            if y != "0":
+                sys.exit("Invalid expansion point. Please choose a point on the real line and try again.")
+    shifts = {x: iv.mpf(x) - iv.mpf("1") for x in set(x for x, y in points)}
+    heights = {y: iv.mpf(y) for y in set(y for x, y in points) if y != "0"}
+    sums = [iv.mpc("0") if riemann else iv.mpf("0") for point in points]
+    nonzero = 0
+    for nonzero, (n, value) in enumerate(input.terms(N), 1):
+        log = iv.log(iv.mpf(n))
+        #Λ(n) n^(x - 1) for each real part
+        scaled = {x: value * iv.exp(shift * log) for x, shift in shifts.items()}
+        #e^(iy log n) for each imaginary part
+        rotations = {y: iv.mpc(iv.cos(height * log), iv.sin(height * log)) for y, height in heights.items()}
+        for k, (x, y) in enumerate(points):
+            if y == "0":
+                sums[k] += scaled[x]
+            else:
+                sums[k] += scaled[x] * rotations[y]
+    profiling.count("lambda_terms_read", N)
+    profiling.count("lambda_terms_nonzero", nonzero)
+    if riemann:
+        #multiply each sum by -1 and subtract 1/z
+        return [(iv.mpc("-1", "0") * sum) - (iv.mpc("1", "0") / iv.mpc(x, y)) for sum, (x, y) in zip(sums, points)]
+    return [iv.mpf("-1") * sum for sum in sums]
+
+
 def error_term(N, x, function):
     '''
     Internal function to calculate the truncation error from the sum over primes
@@ -165,9 +329,87 @@ def error_term(N, x, function):
     error = first_term * (second_term - iv.mpf("1"))
     return error
 
+def run_digamma_program(x, y, m):
+    '''
+    Internal function to find a single digamma value by running one of the compiled FLINT programs
+
+    inputs:
+        x - string, real part of the expansion point
+        y - string, imaginary part of the expansion point
+        m - string, shift used by general_digamma, None to run riemann_digamma instead
+
+    output: interval containing the value printed by the program, complex for riemann_digamma
+    '''
+    #use command line to run compiled C program with two arguments and capture stdout
+    profiling.count("digamma_subprocesses")
+    command = ["./riemann_digamma", x, y] if m is None else ["./general_digamma", x, m]
+    try:
+        process = subprocess.run(command, capture_output=True, encoding="utf-8")
+    except OSError as error:
+        sys.exit("The digamma program " + command[0] + " could not be run: " + str(error) + ". Please compile it and try again.")
+    if process.returncode != 0:
+        sys.exit("The digamma program failed with exit code " + str(process.returncode) + ": " + process.stderr.strip() + ". Please check that it is compiled and FLINT is installed, and try again.")
+    #save output of the program
+    line = process.stdout
+    #split the output on newlines, riemann_digamma prints the real and imaginary parts on separate lines
+    words = line.split("\n")
+    values = []     #empty list to hold results
+    #processing FLINT output into a string that mpmath can understand
+    for word in words:
+        nums = word.strip().split(" +/- ")
+        for i in range(len(nums)):
+            nums[i] = nums[i].strip("[]")
+        #if FLINT output has an error term, construct an interval using those error bounds
+        if len(nums) == 2:
+            base = iv.mpf(nums[0])
+            error = iv.mpf(nums[1])
+            upper = base.b + error.b
+            lower = base.a - error.b
+            values.append(iv.mpf([lower, upper])) #add to result list
+        #if FLINT output has no error (usually if result is exactly zero), construct interval from the output value
+        elif len(nums) == 1 and nums[0] != "":
+            values.append(iv.mpf(nums[0]))  #add to result list
+    if len(values) < (2 if m is None else 1):
+        sys.exit("The digamma program printed no value for " + x + ", please try again.")
+    if m is None:
+        #result list should have two entries representing the real and imaginary parts of the calculation
+        #create a complex interval in mpmath using those entries
+        return iv.mpc(values[0], values[1])
+    return values[0]
+
+_digamma_cache = {}
+
+def digamma_values(inputs):
+    '''
+    Internal function to evaluate a batch of digamma values
+
+    input: list of (x, y, m) tuples of strings, m is None for the Riemann zeta function
+
+    output: list of intervals in the same order as the inputs
+
+    The values are computed inside this process using the FLINT library when it can be loaded,
+    otherwise each value is found by running the compiled programs. flint_digamma.ENGINE can be set
+    to "flint" or "subprocess" to force one of the two. Values that have already been found are
+    not computed again, so characters with the same parity share their digamma values.
+    '''
+    engine = flint_digamma.ENGINE
+    if engine == "flint" and not flint_digamma.available():
+        sys.exit("The FLINT library could not be loaded, please try again with the subprocess engine.")
+    #values are remembered for each precision, the general values do not depend on y
+    keys = [(x, y if m is None else None, m, iv.prec) for x, y, m in inputs]
+    missing = [inputs[i] for i in range(len(inputs)) if keys[i] not in _digamma_cache]
+    if len(missing) > 0:
+        if engine != "subprocess" and flint_digamma.available():
+            values = flint_digamma.digamma_batch(missing)
+            profiling.count("digamma_flint_values", len(missing))
+        else:
+            values = [run_digamma_program(x, y, m) for x, y, m in missing]
+        for (x, y, m), value in zip(missing, values):
+            _digamma_cache[(x, y if m is None else None, m, iv.prec)] = value
+    return [_digamma_cache[key] for key in keys]
+
 def digamma_term(x, y, function, d):
     '''
-    TODO - clean this up and fix docs
     Internal function to calculate the portion of the sum involving the digamma function
 
     inputs:
@@ -176,55 +418,18 @@ def digamma_term(x, y, function, d):
         function - enum representing the type of function being evaluated
         d - fundamental discriminant, input is None if not applicable
 
-    output: interval containing (1/2)*Digamma(3/2 - z/2)
-
+    output: interval containing (1/2)*Digamma(3/2 - z/2) for zeta, and half the sum of the
+    digamma values coming from the gamma factors for the other functions
     '''
-    #use command line to run compiled C program with two arguments and pipe stdout to a text file
     if function.value == Function.RIEMANN.value:
-        #run program using FLINT for calculations
-        process = subprocess.run(["./riemann_digamma", x, y], capture_output=True, encoding="utf-8") 
-        #save output of the program
-        line = process.stdout
-        #split the line on whitespace and collect in a vector
-        words = line.split("\n")
-        values = []     #empty list to hold results
-        #processing FLINT output into a string that mpmath can understand
-        for word in words:
-            nums = word.split(" +/- ")
-            for i in range(len(nums)):
-                nums[i] = nums[i].strip("[]")
-            #if FLINT output has an error term, construct an interval using those error bounds
-            if len(nums) == 2:
-                base = iv.mpf(nums[0])
-                error = iv.mpf(nums[1])
-                upper = base.b + error.b
-                lower = base.a - error.b
-                values.append(iv.mpf([lower, upper])) #add to result list
-            #if FLINT output has no error (usually if result is exactly zero), construct interval from the output value
-            elif len(nums) == 1:
-                values.append(iv.mpf(nums[0]))  #add to result list
-        #result list should have two entries representing the real and imaginary parts of the calculation
-        #create a complex interval in mpmath using those entries
-        value = iv.mpc(values[0], values[1])
+        inputs = [(x, y, None)]
     elif function.value == Function.REAL_DIRICHLET.value:
         #set the value of m based on the sign of the conductor
         if iv.mpf(d) > iv.mpf("0"):
             m = "0"
         else:
             m = "1"
-        #run program using FLINT for calculations
-        process = subprocess.run(["./general_digamma", x, m], capture_output=True, encoding="utf-8") 
-        #process output of FLINT program back into mpmath interval
-        line = process.stdout
-        word = line.strip()
-        nums = word.split(" +/- ")
-        for i in range(len(nums)):
-            nums[i] = nums[i].strip("[]")
-        base = iv.mpf(nums[0])
-        error = iv.mpf(nums[1])
-        upper = base.b + error.b
-        lower = base.a - error.b
-        value = iv.mpf([lower, upper])
+        inputs = [(x, y, m)]
     elif function.value >= Function.RAMANUJAN.value:
         #set values of m depending on the function
         if function.value == Function.RAMANUJAN.value:
@@ -233,23 +438,45 @@ def digamma_term(x, y, function, d):
         if function.value == Function.ELLIPTIC.value:
             m1 = "0.5"
             m2 = "1.5"
-        value = iv.mpf("0")     #initialize the sum
-        #for each m, find the digamma value using FLINT and add to the sum
-        for val in [m1, m2]:
-            process = subprocess.run(["./general_digamma", x, val], capture_output=True, encoding="utf-8")
-            line = process.stdout 
-            word = line.strip()
-            nums = word.split(" +/- ")
-            for i in range(len(nums)):
-                nums[i] = nums[i].strip("[]")
-            base = iv.mpf(nums[0])
-            error = iv.mpf(nums[1])
-            upper = base.b + error.b
-            lower = base.a - error.b
-            value += iv.mpf([lower, upper])
+        inputs = [(x, y, m1), (x, y, m2)]
+    value = iv.mpf("0")     #initialize the sum
+    #add up the digamma values for each m
+    for val in digamma_values(inputs):
+        value += val
     #divide the final term by 2 and return it
     return iv.mpf("1/2") * value
 
+def conductor_term(function, d):
+    '''
+    Internal function to find the logarithmic term of the sum, which only depends on the function
+    '''
+    #find the logarithmic term of the sum based on the chosen function
+    if function.value == Function.RIEMANN.value:
+        log_term = iv.mpf("-1/2") * iv.log(iv.pi)
+    elif function.value == Function.REAL_DIRICHLET.value:
+        log_term = (iv.mpf("1/2") * iv.log(abs(int(d)))) - (iv.mpf("1/2") * iv.log(iv.pi))
+    elif function.value == Function.RAMANUJAN.value:
+        log_term = log_term = (iv.mpf("1/2") * iv.log(iv.mpf("1"))) - (iv.log(iv.pi))
+    elif function.value == Function.ELLIPTIC.value:
+        log_term = log_term = (iv.mpf("1/2") * iv.log(iv.mpf("37"))) - (iv.log(iv.pi))
+    return log_term
+
+def sum_key(x, y, N, function, d, input):
+    '''
+    Internal function to find the key of a sum in the cache of sum_cache
+
+    output: the key, or None if the cache is turned off or the source of the Lambda values is not known
+    '''
+    if not sum_cache.ENABLED or lambda_values.CACHE_DIR == None:
+        return None
+    if isinstance(input, str):
+        source = lambda_values.file_hash(input)
+    else:
+        source = getattr(input, "source", None)
+    if source == None:
+        return None
+    return sum_cache.make_key(function.name, x, y, N, d, source, iv.prec)
+
 def find_sum(x, y, N, function, d, file_name="Lambda_Values/Riemann_Lambda.txt"):
     '''
     Function to find the actual value of a sum over all zeros of the Riemann zeta function
@@ -263,16 +490,16 @@ def find_sum(x, y, N, function, d, file_name="Lambda_Values/Riemann_Lambda.txt")
         file name - name of a file containing e^Lambda(n) for zeta and Lambda(n) for other functions
 
     output: interval containing the sum of 1/(rho - z) for all rho, using z = x + iy
+
+    Sums that have been found before are read from the cache of sum_cache.
     '''
-    #find the logarithmic term of the sum based on the chosen function
-    if function.value == Function.RIEMANN.value:
-        log_term = iv.mpf("-1/2") * iv.log(iv.pi)
-    elif function.value == Function.REAL_DIRICHLET.value:
-        log_term = (iv.mpf("1/2") * iv.log(abs(int(d)))) - (iv.mpf("1/2") * iv.log(iv.pi))
-    elif function.value == Function.RAMANUJAN.value:
-        log_term = log_term = (iv.mpf("1/2") * iv.log(iv.mpf("1"))) - (iv.log(iv.pi))
-    elif function.value == Function.ELLIPTIC.value:
-        log_term = log_term = (iv.mpf("1/2") * iv.log(iv.mpf("37"))) - (iv.log(iv.pi))
+    key = sum_key(x, y, N, function, d, file_name)
+    if key != None:
+        value = sum_cache.get(key, lambda_values.CACHE_DIR)
+        if value != None:
+            profiling.count("find_sum_cache_hits")
+            return value
+    log_term = conductor_term(function, d)
     #find the term of the sum involving the digamma function
     dg_term = digamma_term(x, y, function, d)
     #find the term of the sum involving the sum over the primes
@@ -283,7 +510,45 @@ def find_sum(x, y, N, function, d, file_name="Lambda_Values/Riemann_Lambda.txt")
     upper = log_term + dg_term + vm_term + e_term
     lower = log_term + dg_term + vm_term - e_term
     #return interval using those bounds
-    return iv.mpf([lower.a, upper.b])
+    value = iv.mpf([lower.a, upper.b])
+    if key != None:
+        sum_cache.put(key, value, lambda_values.CACHE_DIR)
+    return value
+
+
+def find_sums(points, N, function, d, file_name="Lambda_Values/Riemann_Lambda.txt"):
+    '''
+    Function to find the actual value of the sum over all zeros at many expansion points
+
+    inputs are the same as find_sum, with points a list of (x, y) tuples of strings
+
+    output: list of intervals, one for each point in the same order, each equal to what find_sum gives
+
+    The sum over the primes is found for every point in one pass with von_mangoldt_terms, skipping
+    the points whose sums are in the cache of sum_cache.
+    '''
+    keys = [sum_key(x, y, N, function, d, file_name) for x, y in points]
+    sums = [None] * len(points)
+    for k, key in enumerate(keys):
+        if key != None:
+            sums[k] = sum_cache.get(key, lambda_values.CACHE_DIR)
+            if sums[k] != None:
+                profiling.count("find_sum_cache_hits")
+    missing = [k for k in range(len(points)) if sums[k] == None]
+    if len(missing) == 0:
+        return sums
+    log_term = conductor_term(function, d)
+    vm_terms = von_mangoldt_terms(N, [points[k] for k in missing], function, file_name)
+    for k, vm_term in zip(missing, vm_terms):
+        x, y = points[k]
+        dg_term = digamma_term(x, y, function, d)
+        e_term = error_term(N, x, function)
+        upper = log_term + dg_term + vm_term + e_term
+        lower = log_term + dg_term + vm_term - e_term
+        sums[k] = iv.mpf([lower.a, upper.b])
+        if keys[k] != None:
+            sum_cache.put(keys[k], sums[k], lambda_values.CACHE_DIR)
+    return sums
 
 
 def ce_contribution(x, beta, eta):
@@ -301,7 +566,90 @@ def ce_contribution(x, beta, eta):
     return val1 + val2
 
 
-def sum_over(zeros, x, y, function):
+SUM_WORKERS = None      #processes used by sum_over for long windows, set with --sum_workers
+SHARD = 1 << 16         #zeros in each piece of a window summed by one process
+
+_sum_pool = {}
+
+def sum_pool(workers):
+    '''
+    Internal function to get the pool of processes used by parallel_sum_over
+
+    The pool is started by forking the first time it is needed and kept for later calls, it is only
+    started again if the number of workers changes or the pool belongs to another process.
+    '''
+    key = (os.getpid(), workers)
+    if key not in _sum_pool:
+        for (pid, count), pool in _sum_pool.items():
+            if pid == os.getpid():
+                pool.shutdown()
+        _sum_pool.clear()
+        context = multiprocessing.get_context("fork")
+        _sum_pool[key] = ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_worker_start)
+    return _sum_pool[key]
+
+def _worker_start():
+    '''
+    Internal function run when a worker process starts, the workers do not start pools of their own
+    '''
+    global SUM_WORKERS
+    SUM_WORKERS = None
+    _sum_pool.clear()
+
+def _shard_sum(shard, offset, x, y, function, engine, prec):
+    '''
+    Internal function run by the worker processes of parallel_sum_over to sum one piece of a window
+
+    inputs:
+        shard - pair of arrays of lower and upper endpoints relative to offset for a view from
+            zero_store, or a list of raw mpmath endpoints otherwise
+        offset - raw endpoints of the shift of a view, None for a list
+    '''
+    iv.prec = prec
+    if offset != None:
+        zeros = ZeroView(shard[0], shard[1], iv.make_mpf(offset))
+    else:
+        zeros = [iv.make_mpf(zero) for zero in shard]
+    return sum_over(zeros, x, y, function, engine)._mpi_
+
+def parallel_sum_over(zeros, x, y, function, engine="mpmath", workers=None):
+    '''
+    Function to find the same sum as sum_over by splitting the zeros into pieces of SHARD zeros and
+    summing the pieces in a pool of processes
+
+    The pieces do not depend on the number of workers and their sums are added in order, so the
+    result is the same interval for any number of workers. The pool is kept between calls.
+
+    inputs are the same as sum_over, with workers giving the number of processes
+    '''
+    pool = sum_pool(workers)
+    futures = []
+    for start in range(0, len(zeros), SHARD):
+        piece = zeros[start:start + SHARD]
+        if hasattr(piece, "offset"):
+            shard = (array("d", piece.lower), array("d", piece.upper))
+            offset = piece.offset._mpi_
+        else:
+            shard = [zero._mpi_ for zero in piece]
+            offset = None
+        futures.append(pool.submit(_shard_sum, shard, offset, x, y, function, engine, iv.prec))
+    profiling.count("sum_shards", len(futures))
+    sum = iv.mpf("0")
+    for future in futures:
+        sum += iv.make_mpf(future.result())
+    return sum
+
+def sum_engine(engine):
+    '''
+    Internal function to check the engine used by sum_over and zero_terms
+
+    output: the engine, exits if it is numpy and NumPy could not be imported
+    '''
+    if engine == "numpy" and not fast_sum.available():
+        sys.exit("NumPy could not be imported, please try again with the mpmath engine.")
+    return engine
+
+def sum_over(zeros, x, y, function, engine="mpmath"):
     '''
     Function to find the total contribution of a set of zeros of the Riemann Zeta Function
 
@@ -310,9 +658,39 @@ def sum_over(zeros, x, y, function):
         x - real part of the expansion point
         y - imaginary part of the expansion point
         function - enum representing the function being evaluated
+        engine - "mpmath" to add up the zeros one at a time in interval arithmetic, or "numpy" to
+            use the vectorized version in fast_sum.py
     output: interval representing the bounds of the sum contribution of the given zeros
+
+    When SUM_WORKERS is set, windows longer than SHARD zeros are split between that many processes
+    by parallel_sum_over.
     '''
+    if SUM_WORKERS != None and len(zeros) > SHARD:
+        return parallel_sum_over(zeros, x, y, function, engine, SUM_WORKERS)
+    if sum_engine(engine) == "numpy":
+        if function.value == Function.RIEMANN.value:
+            return fast_sum.riemann_sum(zeros, x, y)
+        return fast_sum.general_sum(zeros, x)
     sum = iv.mpf("0")   #initialize sum
+    for term in zero_terms(zeros, x, y, function):
+        sum += term
+    return sum
+
+def zero_terms(zeros, x, y, function, engine="mpmath"):
+    '''
+    Function to find the contribution of each zero in a set of zeros separately
+
+    inputs are the same as sum_over
+
+    output: list of intervals in the same order as the zeros
+    '''
+    if sum_engine(engine) == "numpy":
+        if function.value == Function.RIEMANN.value:
+            lower, upper = fast_sum.riemann_terms(zeros, x, y)
+        else:
+            lower, upper = fast_sum.general_terms(zeros, x)
+        return [iv.mpf([a, b]) for a, b in zip(lower.tolist(), upper.tolist())]
+    terms = []
     x = iv.mpf(x)       #turn x and y into intervalz
     y = iv.mpf(y)
     beta = iv.mpf("1/2")    #set the interval for beta
@@ -322,100 +700,787 @@ def sum_over(zeros, x, y, function):
             num = beta - x
             den = (beta - x) ** 2
             den = den + ((zero - y) ** 2)
-            term = num/den
-            sum += term
+            terms.append(num/den)
     #use different sum for a general L-function
     elif function.value >= Function.REAL_DIRICHLET.value:
         for zero in zeros:
             if zero == iv.mpf("0"):
                 num = beta - x
                 den = ((beta - x) ** iv.mpf("2"))
-                sum += num/den
+                terms.append(num/den)
             else:
                 num = iv.mpf("1") - (iv.mpf("2") * x)
                 den = (iv.mpf("1/2") - x) ** iv.mpf("2")
                 den = den + (zero ** iv.mpf("2"))
-                term = num/den
-                sum += term
-    return sum
+                terms.append(num/den)
+    return terms
+
+#constants (c1, c2) of an explicit bound on the number of zeros, set with --count_bound, the defaults
+#in tail_approximation are used when this is None
+COUNT_BOUND = None
 
-def verify(zeros, x, y, N, Tau, function, file, verification, tail=False, d=None):
+def gamma_factors(function, d=None):
     '''
-    Function to verify a general L-function
+    Internal function to find the conductor of a function and the shifts μ_j of its gamma factors
+    Γ_R(s + μ_j), which are used by the tail bounds
+
+    output: conductor and list of strings giving the shifts
+
+    The default constants of the bound on the number of zeros in tail_approximation are only known to
+    hold for Dirichlet L-functions and Dedekind zeta functions, so the Ramanujan τ function needs
+    constants given in COUNT_BOUND.
     '''
-    if float(x) >= 0:
-        sys.exit("Innappropriate expansion point. Please choose a value of x < 0 and try again.")
-    if float(y) < 0:
-        sys.exit("Innappropriate expansion point. Please choose a value of y >= 0 and try again.")
-    #find list of zeros inside the range given by tau
-    upper_val = iv.mpf(y) + iv.mpf(Tau)
-    lower_val = iv.mpf(y) - iv.mpf(Tau)
-    first = find_closest_index(zeros, lower_val)
-    last = find_closest_index(zeros, upper_val)
-    if first[0] == 0 and first[1] > iv.mpf(y) - iv.mpf(Tau):
-        zeros = zeros[:last[0] + 1]
-    else:
-        zeros = zeros[first[0] + 1:last[0] + 1]
-    upper_bound = find_sum(x, y, N, function, d, file).real
-    base_sum = sum_over(zeros, x, y, function)
+    if function.value == Function.REAL_DIRICHLET.value:
+        d = int(d)
+        #even characters have μ = 0 and odd characters have μ = 1
+        return abs(d), ["0"] if d > 0 else ["1"]
+    elif function.value == Function.RAMANUJAN.value:
+        if COUNT_BOUND == None:
+            sys.exit("No explicit bound on the number of zeros is known for the Ramanujan τ function, please give one with --count_bound or try again without --tail.")
+        #the weight 12 factor Γ_C(s + 11/2) = Γ_R(s + 11/2) Γ_R(s + 13/2) up to a constant
+        return 1, ["11/2", "13/2"]
+    sys.exit("The tail bounds are not available for this function, please try again without --tail.")
+
+def find_tail_bounds(points, function, d=None):
+    '''
+    Internal function to find the bounds r and R on the contribution of the zeros outside the window
+
+    inputs:
+        points - list of (x, y, τ) tuples of strings
+        function - enum for the type of function being evaluated
+        d - fundamental discriminant, None if not applicable
+
+    output: list of (r, R) pairs, one for each point in the same order
+    '''
+    if function.value == Function.RIEMANN.value:
+        return tail_bounds_many(points)
+    conductor, shifts = gamma_factors(function, d)
+    if COUNT_BOUND != None:
+        return general_tail_bounds_many(points, conductor, shifts, *COUNT_BOUND)
+    return general_tail_bounds_many(points, conductor, shifts)
+
+def interval_min(a, b):
+    '''
+    Internal function to find an interval containing the minimum of two intervals, even when they overlap
+    '''
+    return iv.mpf([min(a.a, b.a), min(a.b, b.b)])
+
+def check_resolution(resolution):
+    '''
+    Internal function to exit with a message unless the resolution is a positive number, since the
+    search for the verified distance in check_sum would never stop otherwise
+
+    output: the resolution as a Fraction
+    '''
+    try:
+        resolution = Fraction(resolution)
+    except (ValueError, TypeError, ZeroDivisionError):
+        resolution = 0
+    if resolution <= 0:
+        sys.exit("Invalid resolution. Please choose a positive step and try again.")
+    return resolution
+
+def check_sum(base_sum, upper_bound, x, y, Tau, function, verification, tail=False, resolution=1, tail_bound=None, d=None):
+    '''
+    Internal function to compare the contribution of the zeros in the window with the value of the full sum
+
+    inputs:
+        base_sum - interval containing the contribution of the zeros in the window
+        upper_bound - interval containing the real part of the sum over all zeros, from find_sum
+        x, y - real and imaginary parts of the expansion point
+        Tau - half the width of the window
+        function - enum representing the type of function being evaluated
+        verification - enum representing the type of verification
+        tail - whether to use the bounds on the tail of the sum from tail_approximation
+        resolution - Fraction or integer, the verified distance is a multiple of this step
+        tail_bound - (r, R) pair from find_tail_bounds when the tail bounds were already found
+        d - fundamental discriminant for the tail bounds of real Dirichlet characters
+
+    output: list containing the verified distance, or None if the list is incomplete, and a boolean
+    that is False when the comparison deciding the result failed only because the intervals overlapped
+
+    The contribution of a counterexample decreases as its distance η grows, so the largest η giving a
+    contradiction is found by doubling η until the contradiction fails and then bisecting.
+    '''
+    resolution = check_resolution(resolution)
+    decided = True
+    if tail and tail_bound == None:
+        tail_bound = find_tail_bounds([(x, y, Tau)], function, d)[0]
     if verification == Verification.COMPLETENESS and tail == True:
-        upper_tail_bound = R(x, y, Tau)
+        upper_tail_bound = tail_bound[1]
         total = base_sum + upper_tail_bound
         if total.b < upper_bound.a:
-            print("The list given is incomplete")
-            return
+            return [None, True]
+        decided = total.a > upper_bound.b
     #find bound on tail contribution if applicable
-    if tail and function == Function.RIEMANN:
-        lower_tail = r(x, y, Tau)
+    if tail:
+        lower_tail = tail_bound[0]
         base_sum = base_sum + lower_tail
-    #check counterexamples and loop until no contradiction is reached
-    done = False
-    i = 1
-    while not done:
+    #the contribution of a counterexample vanishes far away, so the search could never stop
+    if base_sum.a >= upper_bound.b:
+        sys.exit("The zeros in the window add up to more than the full sum. Please check the zeros and the Lambda values and try again.")
+    def counterexample_total(k):
+        #total with a counterexample at distance k times the resolution
+        profiling.count("counterexample_evaluations")
+        eta = iv.mpf(k * resolution.numerator) / resolution.denominator
         if verification == Verification.RIEMANN_HYPOTHESIS:
-            val1 = ce_contribution(x, "1/2", i)
-            val2 = ce_contribution(x, "1", i)
+            val1 = ce_contribution(x, "1/2", eta)
+            val2 = ce_contribution(x, "1", eta)
         elif verification == Verification.COMPLETENESS:
-            val1 = ce_contribution(x, "1/2", i) * iv.mpf("1/2")
-            val2 = ce_contribution(x, "0", i)
-        contribution = min(val1, val2)
+            val1 = ce_contribution(x, "1/2", eta) * iv.mpf("1/2")
+            val2 = ce_contribution(x, "0", eta)
+        contribution = interval_min(val1, val2)
         if function.value >= Function.REAL_DIRICHLET.value:
             contribution = contribution * 2
-        total = base_sum + contribution
-        if total >= upper_bound:
-            i += 1
+        return base_sum + contribution
+    #a counterexample at distance η is impossible if the total is certainly larger than the full sum,
+    #find low with a contradiction and high without one
+    low = 0
+    high = 1
+    total = counterexample_total(high)
+    while total.a >= upper_bound.b:
+        low = high
+        high *= 2
+        total = counterexample_total(high)
+    while high - low > 1:
+        middle = (low + high) // 2
+        value = counterexample_total(middle)
+        if value.a >= upper_bound.b:
+            low = middle
+        else:
+            high = middle
+            total = value
+    #return largest distance that causes a contradiction
+    distance = low * resolution
+    if distance.denominator == 1:
+        distance = int(distance)
+    return [distance, decided and total.b < upper_bound.a]
+
+def check_with_fallback(base_sum, engine, *args):
+    '''
+    Internal function to run check_sum with the contribution of the zeros found by an engine, finding
+    it again with mpmath when the enclosure from the engine is too wide to decide the result
+
+    inputs:
+        base_sum - function taking the engine and returning the contribution of the zeros in the window
+        engine - engine for sum_over, see sum_engine
+        args - the remaining arguments of check_sum, starting with upper_bound
+
+    output: the same as check_sum
+    '''
+    result = check_sum(base_sum(sum_engine(engine)), *args)
+    if not result[1] and engine != "mpmath":
+        result = check_sum(base_sum("mpmath"), *args)
+    return result
+
+def check_expansion_point(x, y):
+    '''
+    Internal function to exit with a message unless the expansion point has x < 0 and y >= 0
+    '''
+    if float(x) >= 0:
+        sys.exit("Inappropriate expansion point. Please choose a value of x < 0 and try again.")
+    if float(y) < 0:
+        sys.exit("Inappropriate expansion point. Please choose a value of y >= 0 and try again.")
+
+def verify(zeros, x, y, N, Tau, function, file, verification, tail=False, d=None, engine="mpmath", upper_bound=None, resolution=1, tail_bound=None):
+    '''
+    Function to verify a general L-function
+
+    output: largest distance verified around the expansion point, None if the list was shown to be incomplete
+
+    The contribution of the zeros is found with the given engine for sum_over. If the numpy engine
+    gives an enclosure too wide to decide the result, the sum is found again with mpmath. The real
+    part of the sum from find_sum can be passed as upper_bound when it is already known, and the
+    (r, R) pair of tail bounds as tail_bound.
+    '''
+    check_expansion_point(x, y)
+    #find list of zeros inside the range given by tau
+    zeros = zero_window(zeros, y, Tau)
+    profiling.count("zeros_in_window", len(zeros))
+    if upper_bound == None:
+        upper_bound = find_sum(x, y, N, function, d, file).real
+    result = check_with_fallback(lambda engine: sum_over(zeros, x, y, function, engine), engine,
+        upper_bound, x, y, Tau, function, verification, tail, resolution, tail_bound, d)
+    #the distance is None if the list is incomplete
+    return result[0]
+
+PRECISIONS = [15, 20, 30, 40, 60, 100]     #decimal digits tried by verify_adaptive
+
+def verify_adaptive(zeros, x, y, N, Tau, function, file, verification, tail=False, d=None, engine="mpmath", resolution=1):
+    '''
+    Function to verify a general L-function starting at a low working precision
+
+    Every stage is run at the first precision in PRECISIONS. While the comparison deciding the result
+    fails only because the intervals overlap, the stage with the widest enclosure is run again at the
+    next precision. A stage whose enclosure does not shrink by half is limited by the data, such as
+    the errors of the zeros or the truncation of the sum over primes, and is not raised again. Every
+    value is an interval at any precision, so the result is as rigorous as the one from verify.
+
+    inputs are the same as verify
+
+    output: largest distance verified around the expansion point, None if the list was shown to be
+    incomplete, and a dictionary from each stage (find_sum, sum_over and check) to the number of
+    decimal digits it ended at
+    '''
+    check_expansion_point(x, y)
+    #read the Lambda values once at the starting precision, they stay valid at every precision
+    if isinstance(file, str):
+        file = load_lambda(file, N, function)
+    zeros = zero_window(zeros, y, Tau)
+    profiling.count("zeros_in_window", len(zeros))
+    start = iv.dps
+    levels = {"find_sum": 0, "sum_over": 0}     #position in PRECISIONS of each stage
+    values = {}
+    limited = set()
+    def run(stage):
+        iv.dps = PRECISIONS[levels[stage]]
+        if stage == "find_sum":
+            values[stage] = find_sum(x, y, N, function, d, file).real
+        elif levels[stage] == 0:
+            values[stage] = sum_over(zeros, x, y, function, engine)
+        else:
+            #the numpy engine always works with doubles, so higher precisions use mpmath
+            values[stage] = sum_over(zeros, x, y, function)
+    try:
+        run("find_sum")
+        run("sum_over")
+        while True:
+            iv.dps = max(PRECISIONS[level] for level in levels.values())
+            result = check_sum(values["sum_over"], values["find_sum"], x, y, Tau, function, verification, tail, resolution, None, d)
+            if result[1]:
+                break
+            stages = [stage for stage in levels if stage not in limited and levels[stage] + 1 < len(PRECISIONS)]
+            if len(stages) == 0:
+                break
+            stage = max(stages, key=lambda stage: float(values[stage].delta.b))
+            width = float(values[stage].delta.b)
+            levels[stage] += 1
+            run(stage)
+            if float(values[stage].delta.b) > width / 2:
+                limited.add(stage)
+    finally:
+        iv.dps = start
+    precisions = {stage: PRECISIONS[level] for stage, level in levels.items()}
+    precisions["check"] = max(precisions.values())
+    return result[0], precisions
+
+
+def parse_values(values):
+    '''
+    Internal function to turn the values given to --taus, --grid_x or --grid_y into a sorted list of strings
+
+    input: list of strings, each either a single value or a range written as START:STOP:STEP,
+        which includes STOP when it is reached exactly
+    '''
+    nums = []
+    for value in values:
+        if ":" in value:
+            start, stop, step = [Decimal(num.strip()) for num in value.split(":")]
+            if step <= 0:
+                sys.exit("Invalid range of values, please try again.")
+            while start <= stop:
+                nums.append(start)
+                start += step
         else:
-            done = True
-    #return largest integer that causes a contradiction
-    return i - 1
+            nums.append(Decimal(value.strip()))
+    return [str(num) for num in sorted(set(nums))]
+
+def range_arguments(argv):
+    '''
+    Internal function to protect ranges with a negative start, such as -12:-8:2, from argparse, which
+    would read them as options because they start with - and are not numbers
+
+    output: the arguments with a space in front of each such range, parse_values ignores the space
+    '''
+    return [" " + arg if arg[:1] == "-" and ":" in arg and arg[1:2] in "0123456789." else arg for arg in argv]
+
+def distance_sums(zeros, x, y, function):
+    '''
+    Internal function to sort the zeros by their distance from y and add their contributions into running sums
+
+    output: increasing lists of the lower and upper ends of the distances, and a function taking the engine
+    for sum_over and returning the running sums, where entry k is the contribution of the k nearest zeros.
+    The running sums are only found for an engine when they are first needed.
+    '''
+    distances = [abs(zero - iv.mpf(y)) for zero in zeros]
+    order = sorted(range(len(zeros)), key=lambda i: distances[i].a)
+    nearest = [distances[i].a for i in order]
+    farthest = sorted(distance.b for distance in distances)
+    zeros = [zeros[i] for i in order]
+    prefix = {}
+    def running_sums(engine):
+        if engine not in prefix:
+            sums = [iv.mpf("0")]
+            for term in zero_terms(zeros, x, y, function, engine):
+                sums.append(sums[-1] + term)
+            prefix[engine] = sums
+        return prefix[engine]
+    return nearest, farthest, running_sums
+
+def verify_taus(zeros, x, y, N, taus, function, file, verification, tail=False, d=None, engine="mpmath", resolution=1):
+    '''
+    Function to run verify for many values of τ around the same expansion point
+
+    The sum from find_sum does not depend on τ, so it is found once. The contributions of the zeros
+    in the largest window are sorted by their distance from y and added into running sums, so the
+    contribution of the zeros in any smaller window is found with a binary search.
+
+    inputs are the same as verify, except for taus which is a list of strings
+
+    output: list containing [τ, number of zeros in the window, verified distance] for each τ. The distance
+    is None if the list is incomplete, and the number of zeros is None if a zero lies on the edge of the window.
+    '''
+    check_expansion_point(x, y)
+    widest = max(taus, key=lambda tau: Decimal(tau))
+    zeros = list(zero_window(zeros, y, widest))
+    profiling.count("zeros_in_window", len(zeros))
+    upper_bound = find_sum(x, y, N, function, d, file).real
+    nearest, farthest, running_sums = distance_sums(zeros, x, y, function)
+    tails = find_tail_bounds([(x, y, tau) for tau in taus], function, d) if tail else [None] * len(taus)
+    results = []
+    for tau, bounds in zip(taus, tails):
+        bound = iv.mpf(tau)
+        count = bisect.bisect_left(nearest, bound.b)     #zeros that might be closer than τ
+        #zeros that are certainly closer than τ, these must be the same zeros
+        if bisect.bisect_left(farthest, bound.a) != count:
+            results.append([tau, None, None])
+            continue
+        result = check_with_fallback(lambda engine: running_sums(engine)[count], engine,
+            upper_bound, x, y, tau, function, verification, tail, resolution, bounds, d)
+        results.append([tau, count, result[0]])
+    return results
+
 
 
+def minimal_tau(zeros, x, y, N, target, Tau, function, file, verification, tail=False, d=None, engine="mpmath", resolution=1):
+    '''
+    Function to find the smallest τ that verifies the list to a target distance around an expansion point
+
+    The window only changes when τ passes the distance of a zero from y, so the search bisects over
+    the number k of nearest zeros in the window, with τ just above the distance of the k-th zero. The sum
+    from find_sum is found once, the contributions of the zeros come from running sums as in verify_taus,
+    and the tail bounds are found at each τ that is tried. The distance grows with τ when the tail bounds
+    are not used, so the τ found is then the smallest. With the tail bounds the verification still holds
+    at the τ found, but a smaller τ may also work.
+
+    inputs are the same as verify, except for:
+        target - number, the distance that must be verified
+        Tau - largest τ that is considered
+
+    output: list containing the smallest τ as a string, the number of zeros in its window and the distance
+    verified with it
+    '''
+    check_expansion_point(x, y)
+    zeros = list(zero_window(zeros, y, Tau))
+    profiling.count("zeros_in_window", len(zeros))
+    upper_bound = find_sum(x, y, N, function, d, file).real
+    nearest, farthest, running_sums = distance_sums(zeros, x, y, function)
+    limit = Fraction(Tau)
+    def window_tau(k):
+        #shortest decimal above the distance of the k-th zero and below the next one, None if they overlap
+        low = _fraction(farthest[k - 1]) if k > 0 else Fraction(0)
+        high = _fraction(nearest[k]) if k < len(zeros) else limit
+        for digits in range(40):
+            scale = 10 ** digits
+            tau = Fraction(math.floor(low * scale) + 1, scale)
+            if tau < high:
+                return decimal_string(tau)
+        return None
+    results = {}
+    def check(k):
+        #the distance verified with the k nearest zeros, None if the list is incomplete or τ cannot be chosen
+        if k not in results:
+            tau = window_tau(k)
+            results[k] = [tau, k, None]
+            if tau != None:
+                result = check_with_fallback(lambda engine: running_sums(engine)[k], engine,
+                    upper_bound, x, y, tau, function, verification, tail, resolution, None, d)
+                results[k][2] = result[0]
+        return results[k][2] != None and results[k][2] >= target
+    if not check(len(zeros)):
+        sys.exit("The distance cannot be verified with τ up to " + Tau + ". Please try again with a larger τ.")
+    low = 0
+    high = len(zeros)
+    if check(0):
+        high = 0
+    while high - low > 1:
+        middle = (low + high) // 2
+        if check(middle):
+            high = middle
+        else:
+            low = middle
+    return results[high]
+
+def _fraction(value):
+    '''
+    Internal function to turn an interval with equal endpoints into an exact Fraction
+    '''
+    sign, man, exp, bc = value._mpi_[0]
+    if sign:
+        man = -man
+    return Fraction(man) * Fraction(2) ** exp
+
+
+def scan_positions(zeros, values):
+    '''
+    Internal function to find how many zeros lie below each of an increasing list of values, walking
+    along the zeros once instead of bisecting the list for every value
+
+    inputs:
+        zeros - sorted list of zeros, or a ZeroStore
+        values - increasing list of intervals
+
+    output: list of the counts, with None where a zero interval overlaps the value
+    '''
+    if hasattr(zeros, "bounds"):
+        lower_ends, upper_ends = zeros.lower, zeros.upper
+        edges = [zeros.bounds(value) for value in values]
+    else:
+        lower_ends = [zero.a for zero in zeros]
+        upper_ends = [zero.b for zero in zeros]
+        edges = [(value.a, value.b) for value in values]
+    below = 0       #zeros that are certainly below the value
+    not_above = 0   #zeros that might be below the value
+    counts = []
+    for low, high in edges:
+        while below < len(upper_ends) and upper_ends[below] < low:
+            below += 1
+        while not_above < len(lower_ends) and lower_ends[not_above] <= high:
+            not_above += 1
+        counts.append(below if below == not_above else None)
+    return counts
+
+def scan_completeness(zeros, x, ys, N, Tau, function, file, tail=False, d=None, engine="mpmath", resolution=1):
+    '''
+    Function to check the completeness of a list of zeros at many heights along the list
+
+    The windows [y - τ, y + τ] are found by moving two pointers along the zeros as y increases, and the
+    sums from find_sum are found for every height in one pass with find_sums. Every term of the sum over
+    the window depends on y, so the sum is found again at each height, which is fast with the numpy engine.
+
+    inputs are the same as verify, except for ys which is a list of strings giving the heights
+
+    output: list containing [y, number of zeros in the window, verified distance] for each height, where
+    the distance is None if the list is incomplete and the number is None if a zero lies on the edge of
+    the window, and a list of (start, end, reason) gaps, sorted by start. The reason is "incomplete" for
+    windows that are missing a zero and "unverified" for parts of [first height, last height] that are
+    not within the verified distance of any height.
+    '''
+    ys = sorted(ys, key=Decimal)
+    check_expansion_point(x, ys[0])
+    firsts = scan_positions(zeros, [iv.mpf(y) - iv.mpf(Tau) for y in ys])
+    lasts = scan_positions(zeros, [iv.mpf(y) + iv.mpf(Tau) for y in ys])
+    bounds = [value.real for value in find_sums([(x, y) for y in ys], N, function, d, file)]
+    tails = find_tail_bounds([(x, y, Tau) for y in ys], function, d) if tail else [None] * len(ys)
+    results = []
+    for y, first, last, upper_bound, tail_bound in zip(ys, firsts, lasts, bounds, tails):
+        if first == None or last == None:
+            results.append([y, None, None])
+            continue
+        window = zeros[first:last]
+        result = check_with_fallback(lambda engine: sum_over(window, x, y, function, engine), engine,
+            upper_bound, x, y, Tau, function, Verification.COMPLETENESS, tail, resolution, tail_bound, d)
+        results.append([y, last - first, result[0]])
+    #merge the windows that are missing a zero and the parts of the range that are not covered
+    tau = Fraction(Tau)
+    missing = []
+    covered = []
+    for y, count, distance in results:
+        if count != None and distance == None:
+            missing.append([Fraction(y) - tau, Fraction(y) + tau])
+        elif distance != None:
+            covered.append([Fraction(y) - distance, Fraction(y) + distance])
+    gaps = [(start, end, "incomplete") for start, end in merge_ranges(missing)]
+    position = Fraction(ys[0])
+    for start, end in merge_ranges(covered) + [[Fraction(ys[-1]), None]]:
+        if start > position:
+            gaps.append((position, min(start, Fraction(ys[-1])), "unverified"))
+        if end == None or end >= Fraction(ys[-1]):
+            break
+        position = max(position, end)
+    gaps.sort(key=lambda gap: gap[0])
+    return results, [(decimal_string(start), decimal_string(end), reason) for start, end, reason in gaps]
+
+def merge_ranges(ranges):
+    '''
+    Internal function to merge overlapping [start, end] ranges into a sorted list of disjoint ranges
+    '''
+    merged = []
+    for start, end in sorted(ranges):
+        if len(merged) > 0 and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+def decimal_string(value):
+    '''
+    Internal function to write a Fraction as a decimal string, rounded to 12 decimal places if it does not end
+    '''
+    text = format(Decimal(value.numerator) / Decimal(value.denominator), ".12f").rstrip("0").rstrip(".")
+    return text if text != "-0" else "0"
+
+
+_pool_data = {}
+
+def run_pool(worker, tasks, fields, workers=None, output=None):
+    '''
+    Internal function to run worker(*task) for every task on a pool of forked processes
+
+    The data needed by the worker should be put in _pool_data before this is called, so it is
+    inherited by the processes instead of being sent with every task. Each result is a dictionary
+    with the given fields, and is written to the output file as soon as it is finished.
+
+    output: list of the results in the order they finished
+    '''
+    stream = None
+    if output != None:
+        stream = open(output, "w", newline="")
+        if output.endswith(".csv"):
+            writer = csv.DictWriter(stream, fieldnames=fields)
+            writer.writeheader()
+    results = []
+    context = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_worker_start) as pool:
+        futures = [pool.submit(worker, *task) for task in tasks]
+        for future in as_completed(futures):
+            row = future.result()
+            results.append(row)
+            if stream != None:
+                if output.endswith(".csv"):
+                    writer.writerow(row)
+                else:
+                    stream.write(json.dumps(row, default=str) + "\n")
+                stream.flush()
+    if stream != None:
+        stream.close()
+    return results
+
+def _grid_point(x, y):
+    '''
+    Internal function run by the worker processes of verify_grid to verify a single point
+    '''
+    data = _pool_data
+    try:
+        val = verify(data["zeros"], x, y, data["N"], data["Tau"], data["function"], data["file"], data["verification"], data["tail"], data["d"], data["engine"], data["bounds"].get((x, y)), data["resolution"], data["tails"].get((x, y)))
+    except SystemExit as error:
+        return {"x": x, "y": y, "distance": None, "incomplete": None, "error": str(error)}
+    return {"x": x, "y": y, "distance": val, "incomplete": val == None, "error": None}
+
+def verify_grid(zeros, xs, ys, N, Tau, function, file, verification, tail=False, d=None, engine="mpmath", workers=None, output=None, resolution=1):
+    '''
+    Function to run verify at every point of a grid of expansion points using a pool of processes
+
+    The zeros and the Lambda values are read once by this process and shared with the workers,
+    which are started by forking. The sums from find_sum are found for every valid point in one pass
+    with find_sums before the work is split. Results are written to the output file as soon as each
+    point is finished.
+
+    inputs are the same as verify, except for:
+        xs, ys - lists of strings giving the real and imaginary parts of the points
+        workers - number of worker processes, defaults to the number of processors
+        output - name of a file for the results, written as CSV if the name ends in .csv and as one
+            JSON object per line otherwise, or None to only return the results
+
+    output: list of dictionaries with keys x, y, distance, incomplete and error, in the order the points finished
+    '''
+    if isinstance(file, str):
+        file = load_lambda(file, N, function)
+    tasks = [(x, y) for x in xs for y in ys]
+    #points that verify rejects are left to the workers so they report the same error
+    valid = [(x, y) for x, y in tasks if float(x) < 0 and float(y) >= 0 and (y == "0" or function == Function.RIEMANN)]
+    bounds = {}
+    tails = {}
+    if len(valid) > 0:
+        bounds = {point: value.real for point, value in zip(valid, find_sums(valid, N, function, d, file))}
+    if len(valid) > 0 and tail:
+        tails = dict(zip(valid, find_tail_bounds([(x, y, Tau) for x, y in valid], function, d)))
+    _pool_data.update(zeros=zeros, N=N, Tau=Tau, function=function, file=file, verification=verification, tail=tail, d=d, engine=engine, bounds=bounds, tails=tails, resolution=resolution)
+    return run_pool(_grid_point, tasks, ["x", "y", "distance", "incomplete", "error"], workers, output)
+
+def optimize_x(zeros, y, N, Tau, function, file, verification, low, high, tail=False, d=None, engine="mpmath", workers=None, resolution=1, points=9, rounds=3):
+    '''
+    Function to search for the real part of the expansion point giving the largest verified distance
+
+    The interval [low, high] is scanned at evenly spaced points with verify_grid, then the scan is
+    repeated between the neighbours of the best point, so each round narrows the interval. The
+    Lambda values are read once and the digamma values are remembered, so they are shared by every
+    round, and the sums over the primes of each round are found in a single pass.
+
+    inputs are the same as verify_grid, except for:
+        low, high - strings, the ends of the interval of real parts to search, both below 0
+        points - number of real parts verified in each round
+        rounds - number of times the scan is repeated
+
+    output: the best real part and its result, and a list of the results of every point that was
+    verified, sorted by the real part. The results are dictionaries as given by verify_grid, and the
+    best one is None if every point failed
+    '''
+    low = Decimal(low)
+    high = Decimal(high)
+    if high >= 0 or low >= high:
+        sys.exit("Invalid interval for x. Please choose two values below 0 with the smaller first and try again.")
+    if isinstance(file, str):
+        file = load_lambda(file, N, function)
+    def score(row):
+        #incomplete lists and errors are worse than every verified distance
+        if row["distance"] == None:
+            return -1
+        return row["distance"]
+    results = {}
+    best = None
+    for i in range(rounds):
+        step = (high - low) / (points - 1)
+        xs = [format((low + j * step).normalize(), "f") for j in range(points)]
+        new = [x for x in dict.fromkeys(xs) if x not in results]
+        if len(new) > 0:
+            for row in verify_grid(zeros, new, [y], N, Tau, function, file, verification, tail, d, engine, workers, None, resolution):
+                results[row["x"]] = row
+        position = max(range(points), key=lambda j: score(results[xs[j]]))
+        if results[xs[position]]["error"] == None:
+            best = xs[position]
+        #continue between the neighbours of the best point
+        low = Decimal(xs[max(position - 1, 0)])
+        high = Decimal(xs[min(position + 1, points - 1)])
+    rows = [results[x] for x in sorted(results, key=Decimal)]
+    return best, results.get(best), rows
+
+def _conductor(d):
+    '''
+    Internal function run by the worker processes of verify_conductors to verify a single character
+    '''
+    data = _pool_data
+    zeros = data["zeros"][d]
+    source = DirichletLambda(d, data["table"])
+    try:
+        val = verify(zeros, data["x"], "0", data["N"], data["Tau"], Function.REAL_DIRICHLET, source, data["verification"], data["tail"], d, data["engine"], resolution=data["resolution"])
+    except SystemExit as error:
+        return {"conductor": d, "zeros": len(zeros), "distance": None, "incomplete": None, "error": str(error)}
+    return {"conductor": d, "zeros": len(zeros), "distance": val, "incomplete": val == None, "error": None}
+
+def verify_conductors(zeros, x, N, Tau, verification, engine="mpmath", workers=None, output=None, resolution=1, tail=False):
+    '''
+    Function to verify many real Dirichlet characters, with Λ(n) found from the Kronecker symbol
+
+    The prime powers and their logarithms are found once and shared by every character, and the
+    digamma values are found once for each parity before the work is split between the processes.
+
+    inputs:
+        zeros - dictionary from each fundamental discriminant to its list of zeros, see read_conductor_zeros
+        x - real part of the expansion point, the imaginary part is 0
+        N, Tau, verification, engine, tail - same as verify
+        workers, output - same as verify_grid
+
+    output: list of dictionaries with keys conductor, zeros, distance, incomplete and error
+    '''
+    table = PrimeLogTable(N)
+    for d in [1, -1]:
+        digamma_term(x, "0", Function.REAL_DIRICHLET, d)
+    _pool_data.update(zeros=zeros, x=x, N=N, Tau=Tau, verification=verification, engine=engine, table=table, resolution=resolution, tail=tail)
+    tasks = [(d,) for d in sorted(zeros)]
+    return run_pool(_conductor, tasks, ["conductor", "zeros", "distance", "incomplete", "error"], workers, output)
+
+
+def window_range(args, shift=0):
+    '''
+    Internal function to find the range of ordinates used by a run from the command line options,
+    so only that part of a file of zeros has to be read
+
+        shift: value subtracted from the ordinates, the starting value of Hiary's files
+
+    output: floats giving the lower and upper ends of the range, rounded outwards
+    '''
+    ys = [args.point[1]]
+    if args.grid_y != None:
+        ys = parse_values(args.grid_y)
+    if args.scan != None:
+        ys = parse_values(args.scan)
+    taus = [tau for tau in [args.Riemann and args.Riemann[0], args.Dirichlet and str(args.Dirichlet[1]), args.Ramanujan] if tau]
+    if args.taus != None:
+        taus += parse_values(args.taus)
+    tau = max(Decimal(tau) for tau in taus)
+    low = min(Decimal(y) for y in ys) - tau - shift
+    high = max(Decimal(y) for y in ys) + tau - shift
+    return math.nextafter(float(low), -math.inf), math.nextafter(float(high), math.inf)
+
+#functions timed by --profile, tail_bounds_many and general_tail_bounds_many are the tail bounds imported from tail_approximation
+PROFILED = ["read_hiary_zeros", "read_zeros", "read_conductor_zeros", "read_zero_list", "read_hiary_zero_list", "ZeroStore", "zero_window", "load_lambda",
+    "von_mangoldt_term", "von_mangoldt_terms", "error_term", "run_digamma_program", "digamma_values", "digamma_term",
+    "find_sum", "find_sums", "sum_over", "zero_terms", "tail_bounds_many", "general_tail_bounds_many", "check_sum", "verify", "verify_adaptive",
+    "verify_taus", "verify_grid", "verify_conductors", "optimize_x"]
 
 def main():
     iv.dps = 40
     parser = argparse.ArgumentParser(description="Program to verify the Riemann Hypothesis or completeness within a subsection of a given list of zeros. Currently works with the Riemann zeta function, real Dirichlet functions, the Ramanujan tau function, and elliptic curves.")
     parser.add_argument("-R", "--Riemann", action='store', nargs=1, help='verify the Riemann zeta function around a point z = x + iy using zeros in a range of [y - τ, y + τ]', metavar="TAU")
     parser.add_argument("-D", "--Dirichlet", action='store', nargs=2, type=int, help='verify a real Dirichlet function around a point z = x + iy using zeros in a range of [y - τ, y + τ]', metavar=("CONDUCTOR", "TAU"))
+    parser.add_argument("-C", "--conductors", nargs=2, help="verify every real Dirichlet character in a file with the fundamental discriminant in the first column and its zeros in the second, using Λ(n) from the sieve", metavar=("FILENAME", "TAU"))
     parser.add_argument("-T", "--Ramanujan", action='store', help='verify the Ramanujan tau function around a point z = x + iy using zeros in a range of [y - τ, y + τ]', metavar="TAU")
     parser.add_argument("-p", "--point", nargs=2, help="Point where the expansion is centered, default is -1", default=["-1", "0"], metavar=("REAL", "IMAGINARY"))
     parser.add_argument("-l", "--Lambda", nargs=2, help="File containing e^Λ(n) for zeta or Λ(n) for other functions and number of terms to use for the sum over primes", metavar=("FILENAME", "TERMS"))
+    parser.add_argument("-s", "--sieve", type=int, help="generate Λ(n) with a prime sieve instead of reading a file, using this many terms. Works for every function, using the Kronecker symbol for real Dirichlet characters and the q-expansion of Δ for the Ramanujan tau function", metavar="TERMS")
     parser.add_argument("-H", "--H_zeros", nargs=3, help="use file of zero ordinates created by Dr. Ghaith Hiary", metavar=("FILENAME", "SHIFT", "LINES"))
     parser.add_argument("-z", "--zeros", nargs=2, help="use file of zero ordinates", metavar=("FILE_NAME", "COLUMN"))
-    parser.add_argument("-t", "--tail", action='store_true', help='include upper and lower bounds on the tail of the sum in the verification. Currently only works for the Riemann zeta function')
+    parser.add_argument("--lazy", action="store_true", help="only read the zeros near the points being verified from a sorted file given with -z or -H, using an index saved next to the file")
+    parser.add_argument("--compact", action="store_true", help="keep the zeros from -z or -H in arrays of floats and only create intervals for the zeros that are used, which takes much less memory for long lists")
+    parser.add_argument("-b", "--binary_zeros", nargs=1, help="use a binary zero store created by zero_store.py", metavar="FILENAME")
+    parser.add_argument("-t", "--tail", action='store_true', help='include upper and lower bounds on the tail of the sum in the verification, so zeros above τ do not have to be in the list, can be used with -R, -D and -C, and with -T when --count_bound is given')
     parser.add_argument("-c", "--completeness", action="store_true", help="verify completeness of a list of zeros instead of the Riemann Hypothesis")
-    args = parser.parse_args()
-    if args.Lambda == None:
+    parser.add_argument("--taus", nargs="+", help="verify once for each of these values of τ instead of the value given with the function, ranges can be written as START:STOP:STEP", metavar="TAU")
+    parser.add_argument("--min_tau", help="find the smallest τ, up to the value given with the function, that verifies this distance around the point", metavar="DISTANCE")
+    parser.add_argument("--scan", nargs="+", help="check completeness at each of these imaginary parts in one pass along the list and report the gaps, ranges can be written as START:STOP:STEP", metavar="IMAGINARY")
+    parser.add_argument("--grid_x", nargs="+", help="verify at every combination of these real parts and the imaginary parts from --grid_y, ranges can be written as START:STOP:STEP, including negative ones such as -12:-8:2", metavar="REAL")
+    parser.add_argument("--grid_y", nargs="+", help="imaginary parts of the points to verify, see --grid_x", metavar="IMAGINARY")
+    parser.add_argument("--optimize", nargs=2, help="search this interval of real parts for the expansion point giving the largest verified distance, the imaginary part is taken from --point", metavar=("LOW", "HIGH"))
+    parser.add_argument("--workers", type=int, help="number of processes used to verify a grid of points, many characters or the points of the optimizer, default is the number of processors")
+    parser.add_argument("-o", "--output", help="file for the results of a grid of points, many characters or every point tried by the optimizer, written as CSV if the name ends in .csv and as one JSON object per line otherwise")
+    parser.add_argument("--cache_dir", help="directory where tables of Lambda values and full sums are cached between runs. The cache is on by default in ~/.cache/zeta_function_project, or in the directory given by the environment variable ZETA_CACHE_DIR, where an empty value turns it off")
+    parser.add_argument("--no_cache", action="store_true", help="do not read or write anything in the cache directory, the Lambda values are read from the text file every time and full sums are not stored")
+    parser.add_argument("--no_sum_cache", action="store_true", help="find the full sum again instead of reading it from the cache of earlier results, which is kept in the same directory as the Lambda values")
+    parser.add_argument("--count_bound", nargs=2, help="constants C1 and C2 of an explicit bound |N(t) - (t/π) log(q (t/2πe)^d)| <= C1 log(q Π_j (t + 2 + μ_j)) + C2 d for t >= 1 on the number of zeros, used by --tail in place of the defaults, which only hold for Dirichlet L-functions. Needed for --tail with -T", metavar=("C1", "C2"))
+    parser.add_argument("--sum", choices=["mpmath", "numpy"], default="mpmath", help="how to add up the contributions of the zeros, numpy is much faster for large windows and falls back to mpmath when its result is too wide")
+    parser.add_argument("--resolution", default="1", help="step between the distances that are checked for counterexamples, which can be a fraction such as 1/4 or a decimal such as 0.1, default is 1", metavar="STEP")
+    parser.add_argument("--adaptive", action="store_true", help="start at low precision and only raise the precision of the stages that are too wide to decide the result, printing the precision each stage ended at")
+    parser.add_argument("--profile", nargs="?", const="-", help="record the time spent in each stage and counters such as the number of zeros and Lambda values used, and write them as JSON when the program ends, to this file or to standard error", metavar="FILENAME")
+    parser.add_argument("--sum_workers", type=int, help="number of processes used to add up the contributions of the zeros when the window holds more than " + str(SHARD) + " zeros, the result does not depend on this number")
+    parser.add_argument("--digamma", choices=["auto", "flint", "subprocess"], default="auto", help="how to evaluate the digamma values: in this process through the FLINT library, by running the compiled programs, or in process when FLINT can be loaded (default)")
+    args = parser.parse_args(range_arguments(sys.argv[1:]))
+    if args.profile != None:
+        profiling.enable(None if args.profile == "-" else args.profile)
+        profiling.instrument(sys.modules[__name__], PROFILED)
+    flint_digamma.ENGINE = args.digamma
+    global SUM_WORKERS, COUNT_BOUND
+    SUM_WORKERS = args.sum_workers
+    if args.count_bound != None:
+        try:
+            COUNT_BOUND = [str(Fraction(value)) for value in args.count_bound]
+        except (ValueError, ZeroDivisionError):
+            COUNT_BOUND = ["-1"]
+        if any(Fraction(value) < 0 for value in COUNT_BOUND):
+            sys.exit("Invalid bound on the number of zeros. Please choose constants >= 0 and try again.")
+    resolution = check_resolution(args.resolution)
+    if args.cache_dir != None:
+        lambda_values.CACHE_DIR = args.cache_dir
+    if args.no_cache:
+        lambda_values.CACHE_DIR = None
+    if args.no_sum_cache:
+        sum_cache.ENABLED = False
+    if args.Lambda == None and args.sieve == None:
         sys.exit("No Lambda values provided, please try again.")
-    if args.zeros != None and args.H_zeros != None:
-        sys.exit("Too many zero files. Please try again and provide one file with all zero ordinates.")
-    elif args.zeros == None and args.H_zeros == None:
-        sys.exit("No files with zero ordinates provided, please try again")
-    elif args.zeros != None:
-        zeros = read_zeros(args.zeros[0], args.zeros[1])
-    elif args.H_zeros != None:
-        zeros = read_hiary_zeros(args.H_zeros[1], args.H_zeros[0], int(args.H_zeros[2]))
+    elif args.Lambda != None and args.sieve != None:
+        sys.exit("Too many sources of Lambda values. Please try again with either a file or the sieve.")
+    elif args.Lambda != None:
+        lambda_source, N = args.Lambda[0], int(args.Lambda[1])
+    elif args.Riemann != None:
+        lambda_source, N = RiemannLambda(), args.sieve
+    elif args.Ramanujan != None:
+        lambda_source, N = RamanujanLambda(), args.sieve
+    elif args.Dirichlet != None:
+        lambda_source, N = DirichletLambda(args.Dirichlet[0]), args.sieve
+    else:
+        lambda_source, N = None, args.sieve
     count = 0
-    for arg in [args.Riemann, args.Ramanujan, args.Dirichlet]:
+    for arg in [args.Riemann, args.Ramanujan, args.Dirichlet, args.conductors]:
         if arg != None:
             count += 1
     if count == 0:
@@ -425,12 +1490,109 @@ def main():
     verification = Verification.RIEMANN_HYPOTHESIS
     if args.completeness == True:
         verification = Verification.COMPLETENESS
+    if args.conductors != None:
+        if args.sieve == None:
+            sys.exit("Verifying many characters needs the Lambda values from the sieve, please try again with --sieve.")
+        zeros = read_conductor_zeros(args.conductors[0])
+        profiling.count("zeros_read", sum(len(values) for values in zeros.values()))
+        results = verify_conductors(zeros, args.point[0], N, args.conductors[1], verification, args.sum, args.workers, args.output, resolution, args.tail)
+        if args.output == None:
+            for row in results:
+                print(json.dumps(row, default=str))
+        return
+    sources = [arg for arg in [args.zeros, args.H_zeros, args.binary_zeros] if arg != None]
+    if len(sources) > 1:
+        sys.exit("Too many zero files. Please try again and provide one file with all zero ordinates.")
+    elif len(sources) == 0:
+        sys.exit("No files with zero ordinates provided, please try again")
+    elif args.zeros != None and args.lazy:
+        low, high = window_range(args)
+        zeros = zero_index.read_window(args.zeros[0], int(args.zeros[1]), low, high)
+    elif args.zeros != None and args.compact:
+        zeros = read_zero_list(args.zeros[0], int(args.zeros[1]))
+    elif args.zeros != None:
+        zeros = read_zeros(args.zeros[0], int(args.zeros[1]))
+    elif args.H_zeros != None and args.lazy:
+        low, high = window_range(args, Decimal(args.H_zeros[1]))
+        zeros = zero_index.read_window(args.H_zeros[0], None, low, high, "1e-10", args.H_zeros[1], int(args.H_zeros[2]))
+    elif args.H_zeros != None and args.compact:
+        zeros = read_hiary_zero_list(args.H_zeros[1], args.H_zeros[0], int(args.H_zeros[2]))
+    elif args.H_zeros != None:
+        zeros = read_hiary_zeros(args.H_zeros[1], args.H_zeros[0], int(args.H_zeros[2]))
+    elif args.binary_zeros != None:
+        zeros = ZeroStore(args.binary_zeros[0])
+    profiling.count("zeros_read", len(zeros))
     if args.Riemann != None:
-        val = verify(zeros, args.point[0], args.point[1], int(args.Lambda[1]), args.Riemann[0], Function.RIEMANN, args.Lambda[0], verification, args.tail)
+        function, Tau, d, tail = Function.RIEMANN, args.Riemann[0], None, args.tail
     elif args.Dirichlet != None:
-        val = verify(zeros, args.point[0], args.point[1], int(args.Lambda[1]), args.Dirichlet[1], Function.REAL_DIRICHLET, args.Lambda[0], verification, False, args.Dirichlet[0])
+        function, Tau, d, tail = Function.REAL_DIRICHLET, args.Dirichlet[1], args.Dirichlet[0], args.tail
     elif args.Ramanujan != None:
-        val = verify(zeros, args.point[0], args.point[1], int(args.Lambda[1]), args.Ramanujan[0], Function.RAMANUJAN, args.Lambda[0], verification)
-    print("The list has been verified to a distance of", val)
+        if args.tail and COUNT_BOUND == None:
+            sys.exit("No explicit bound on the number of zeros is known for the Ramanujan τ function, please give one with --count_bound or try again without --tail.")
+        function, Tau, d, tail = Function.RAMANUJAN, args.Ramanujan, None, args.tail
+    if args.min_tau != None:
+        tau, count, val = minimal_tau(zeros, args.point[0], args.point[1], N, Fraction(args.min_tau), Tau, function, lambda_source, verification, tail, d, args.sum, resolution)
+        print("The smallest τ is", tau + ", with", count, "zeros in the window, verifying a distance of", val)
+        return
+    if args.scan != None:
+        results, gaps = scan_completeness(zeros, args.point[0], parse_values(args.scan), N, Tau, function, lambda_source, tail, d, args.sum, resolution)
+        for y, count, val in results:
+            if count == None:
+                print("y =", y + ": a zero lies on the edge of the window")
+            elif val == None:
+                print("y =", y + ":", count, "zeros, the list given is incomplete")
+            else:
+                print("y =", y + ":", count, "zeros, the list is complete to a distance of", val)
+        for start, end, reason in gaps:
+            if reason == "incomplete":
+                print("Gap: the list is missing a zero between", start, "and", end)
+            else:
+                print("Gap: the list has not been verified between", start, "and", end)
+        return
+    if args.taus != None:
+        results = verify_taus(zeros, args.point[0], args.point[1], N, parse_values(args.taus), function, lambda_source, verification, tail, d, args.sum, resolution=resolution)
+        for tau, count, val in results:
+            if count == None:
+                print("τ =", tau + ": a zero lies on the edge of the window, please choose a different value")
+            elif val == None:
+                print("τ =", tau + ":", count, "zeros, the list given is incomplete")
+            else:
+                print("τ =", tau + ":", count, "zeros, the list has been verified to a distance of", val)
+        return
+    if args.optimize != None:
+        best, row, rows = optimize_x(zeros, args.point[1], N, Tau, function, lambda_source, verification, args.optimize[0], args.optimize[1], tail, d, args.sum, args.workers, resolution)
+        if args.output != None:
+            with open(args.output, "w", newline="") as stream:
+                if args.output.endswith(".csv"):
+                    writer = csv.DictWriter(stream, fieldnames=["x", "y", "distance", "incomplete", "error"])
+                    writer.writeheader()
+                    writer.writerows(rows)
+                else:
+                    for result in rows:
+                        stream.write(json.dumps(result, default=str) + "\n")
+        if best == None:
+            print("No real part in the interval could be verified")
+        elif row["distance"] == None:
+            print("Best real part:", best + ", the list given is incomplete")
+        else:
+            print("Best real part:", best + ", the list has been verified to a distance of", row["distance"])
+        return
+    if args.grid_x != None or args.grid_y != None:
+        xs = parse_values(args.grid_x) if args.grid_x != None else [args.point[0]]
+        ys = parse_values(args.grid_y) if args.grid_y != None else [args.point[1]]
+        results = verify_grid(zeros, xs, ys, N, Tau, function, lambda_source, verification, tail, d, args.sum, args.workers, args.output, resolution)
+        if args.output == None:
+            for row in results:
+                print(json.dumps(row, default=str))
+        return
+    if args.adaptive:
+        val, precisions = verify_adaptive(zeros, args.point[0], args.point[1], N, Tau, function, lambda_source, verification, tail, d, args.sum, resolution)
+        print("Precision used:", ", ".join(stage + " " + str(digits) + " digits" for stage, digits in precisions.items()))
+    else:
+        val = verify(zeros, args.point[0], args.point[1], N, Tau, function, lambda_source, verification, tail, d, args.sum, resolution=resolution)
+    if val == None:
+        print("The list given is incomplete")
+    else:
+        print("The list has been verified to a distance of", val)
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,93 @@
+'''
+Values of Λ(n) for the L-functions of real Dirichlet characters
+
+The real primitive character with fundamental discriminant d is the Kronecker symbol χ_d(n) = (d/n),
+so the coefficients of -L'/L are χ_d(p)^k log p at n = p^k and zero elsewhere. The prime powers
+and the logarithms only depend on N, so they are found once in a PrimeLogTable and shared by
+every character.
+'''
+from mpmath import iv
+from prime_sieve import prime_powers
+
+
+def kronecker(d, p):
+    '''
+    Function to find the Kronecker symbol (d/p) for a prime p
+    '''
+    if p == 2:
+        if d % 2 == 0:
+            return 0
+        if d % 8 in [1, 7]:
+            return 1
+        return -1
+    residue = d % p
+    if residue == 0:
+        return 0
+    #Euler's criterion
+    if pow(residue, (p - 1) // 2, p) == 1:
+        return 1
+    return -1
+
+
+class PrimeLogTable:
+    '''
+    Prime powers n = p^k <= N together with intervals containing log p
+
+        powers: increasing list of the prime powers
+        primes: the prime p for each entry of powers
+        logs: interval containing log p for each entry of powers
+    '''
+    def __init__(self, N):
+        self.limit = N
+        self.prec = iv.prec
+        self.powers = []
+        self.primes = []
+        self.logs = []
+        found = {}
+        for n, p in prime_powers(N):
+            if p not in found:
+                found[p] = iv.log(iv.mpf(p))
+            self.powers.append(n)
+            self.primes.append(p)
+            self.logs.append(found[p])
+            #only primes with higher powers below N have to be remembered
+            if p * p > N:
+                del found[p]
+
+
+class DirichletLambda:
+    '''
+    Source of the nonzero values Λ(n) = χ_d(n) Λ(n) for the real character with fundamental
+    discriminant d, which can be passed to von_mangoldt_term in place of a file
+
+        table: PrimeLogTable to share between characters, one is made when it is needed if this is None
+    '''
+    source = "kronecker"    #identifies these values in the cache of sum_cache, together with d
+
+    def __init__(self, d, table=None):
+        self.d = int(d)
+        self.table = table
+
+    def terms(self, N):
+        '''
+        Generator yielding (n, Λ(n)) for the nonzero terms with n <= N
+        '''
+        if self.table == None or self.table.limit < N or self.table.prec != iv.prec:
+            self.table = PrimeLogTable(N)
+        table = self.table
+        base = {}       #χ(p) for primes with higher powers below N
+        current = {}    #χ(p^k) for the last power of those primes
+        for n, p, log in zip(table.powers, table.primes, table.logs):
+            if n > N:
+                break
+            if n == p:
+                character = kronecker(self.d, p)
+                if p * p <= N:
+                    base[p] = character
+                    current[p] = character
+            else:
+                #χ(p^k) = χ(p)^k
+                character = current[p] * base[p]
+                current[p] = character
+            if character != 0:
+                yield n, log * character
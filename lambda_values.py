@@ -0,0 +1,204 @@
+'''
+Tables of the nonzero values of the Von Mangoldt function Λ(n)
+
+A table can be passed to von_mangoldt_term in place of a file name, so the values only have to
+be read from the file once when the same sum is needed at many expansion points. Tables can also
+be cached on disk with cached_lambda, so later runs skip parsing the file and evaluating logarithms.
+
+The cache directory is CACHE_DIR. It defaults to ~/.cache/zeta_function_project and can be changed
+with the environment variable ZETA_CACHE_DIR, where an empty value turns the cache off.
+When the directory cannot be written the values are still read, they are only not saved.
+'''
+import hashlib, os, struct
+from mpmath import iv
+from mpmath.libmp import from_man_exp
+import block_file
+
+
+class LambdaTable:
+    '''
+    Nonzero values of Λ(n) for every n up to a limit
+
+        indices: increasing list of the n with Λ(n) != 0
+        values: list of intervals containing Λ(n) for those n
+        limit: largest n covered by the table
+        source: hash of the file the values were read from, None if it is not known
+    '''
+    def __init__(self, indices, values, limit, source=None):
+        self.indices = indices
+        self.values = values
+        self.limit = limit
+        self.source = source
+
+    def __len__(self):
+        return len(self.indices)
+
+    def terms(self, N):
+        '''
+        Generator yielding (n, Λ(n)) for the nonzero terms with n <= N
+        '''
+        if N > self.limit:
+            raise ValueError("Not enough Λ values for " + str(N) + " terms, the table stops at " + str(self.limit))
+        for n, value in zip(self.indices, self.values):
+            if n > N:
+                break
+            yield n, value
+
+
+def read_lambda(file_name, N, exponential, start=0):
+    '''
+    Function to read the nonzero values of Λ(n) for n <= N from a text file with one value per line
+
+    inputs:
+        file_name - name of the file, the first line holds the value for n = 1, can also be a block
+            file written by block_file.py
+        N - number of lines to read
+        exponential - True if the file holds e^Λ(n) as for the Riemann zeta function, False if it
+            holds Λ(n) directly as for the other functions
+        start - number of lines to skip, so only the values for start < n <= N are read
+
+    output: LambdaTable with the values that were read
+    '''
+    indices = []
+    values = []
+    n = start
+    with block_file.open_text(file_name, start) as file:
+        for line in file:
+            word = line.strip()
+            if n == N or word == "":
+                break
+            n += 1
+            if exponential and word != "1":     #log(1) = 0, so these lines are skipped
+                indices.append(n)
+                values.append(iv.log(iv.mpf(word)))
+            elif not exponential and word != "0":
+                indices.append(n)
+                values.append(iv.mpf(word))
+    return LambdaTable(indices, values, n)
+
+
+CACHE_DIR = os.environ.get("ZETA_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "zeta_function_project"))
+if CACHE_DIR == "":
+    CACHE_DIR = None    #None turns the cache off
+MAGIC = b"LAMBDA01"
+HEADER = struct.Struct("<QQQQ")     #limit, number of values, precision and whether the whole file was read
+
+_hashes = {}
+_tables = {}
+
+
+def file_hash(file_name):
+    '''
+    Function to find the SHA-256 hash of the contents of a file
+
+    The hash is remembered for as long as the size and modification time of the file stay the same.
+    '''
+    info = os.stat(file_name)
+    key = (os.path.abspath(file_name), info.st_size, info.st_mtime_ns)
+    if key not in _hashes:
+        digest = hashlib.sha256()
+        with open(file_name, "rb") as file:
+            for block in iter(lambda: file.read(1 << 20), b""):
+                digest.update(block)
+        _hashes[key] = digest.hexdigest()
+    return _hashes[key]
+
+
+def _write_table(path, table, complete):
+    '''
+    Internal function to save a LambdaTable, storing the endpoints of every interval exactly
+    as a signed mantissa and an exponent
+    '''
+    width = iv.prec // 8 + 2
+    data = bytearray()
+    for n, value in zip(table.indices, table.values):
+        data += struct.pack("<Q", n)
+        for sign, man, exp, bc in value._mpi_:
+            if sign:
+                man = -man
+            data += man.to_bytes(width, "little", signed=True) + struct.pack("<q", exp)
+    #write to a temporary file first so other processes never see a partial table
+    temp = path + "." + str(os.getpid())
+    with open(temp, "wb") as file:
+        file.write(MAGIC)
+        file.write(HEADER.pack(table.limit, len(table), iv.prec, complete))
+        file.write(data)
+    os.replace(temp, path)
+
+def _save_table(path, table, complete):
+    '''
+    Internal function to save a table in the cache, a table that cannot be saved, for example
+    because the cache directory is not writable, is still used for this run
+    '''
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _write_table(path, table, complete)
+    except OSError:
+        pass
+
+def _read_table(path):
+    '''
+    Internal function to load a LambdaTable saved by _write_table
+
+    output: the table and whether it covers the whole Lambda file
+    '''
+    with open(path, "rb") as file:
+        data = file.read()
+    if data[:len(MAGIC)] != MAGIC:
+        return None, False
+    limit, count, prec, complete = HEADER.unpack_from(data, len(MAGIC))
+    width = prec // 8 + 2
+    size = 8 + 2 * (width + 8)
+    position = len(MAGIC) + HEADER.size
+    indices = []
+    values = []
+    for i in range(count):
+        indices.append(struct.unpack_from("<Q", data, position)[0])
+        position += 8
+        endpoints = []
+        for j in range(2):
+            man = int.from_bytes(data[position:position + width], "little", signed=True)
+            exp = struct.unpack_from("<q", data, position + width)[0]
+            endpoints.append(from_man_exp(man, exp))
+            position += width + 8
+        values.append(iv.make_mpf(tuple(endpoints)))
+    return LambdaTable(indices, values, limit), bool(complete)
+
+def cached_lambda(file_name, N, exponential, cache_dir=None):
+    '''
+    Function to find the nonzero values of Λ(n) for n <= N, using a cache on disk
+
+    The table is stored under the hash of the file contents and the working precision, so the text
+    is only parsed and the logarithms only evaluated the first time a file is used. A table built
+    for a smaller N is extended with the values after its last line when more terms are needed.
+
+    inputs are the same as read_lambda, with cache_dir giving the directory of the cache, which
+    defaults to CACHE_DIR
+
+    output: LambdaTable with the values
+    '''
+    if cache_dir == None:
+        cache_dir = CACHE_DIR
+    kind = "exp" if exponential else "raw"
+    name = "lambda-" + file_hash(file_name)[:32] + "-" + str(iv.prec) + "-" + kind + ".bin"
+    path = os.path.join(cache_dir, name)
+    #check tables already loaded by this process before looking on disk
+    table, complete = _tables.get(path, (None, False))
+    if table == None and os.path.exists(path):
+        try:
+            table, complete = _read_table(path)
+        except OSError:
+            table, complete = None, False
+    if table == None:
+        table = read_lambda(file_name, N, exponential)
+        complete = table.limit < N
+        _save_table(path, table, complete)
+    elif table.limit < N and not complete:
+        #only the lines after the end of the table are read, a block file seeks straight to them
+        extra = read_lambda(file_name, N, exponential, table.limit)
+        complete = extra.limit < N
+        table = LambdaTable(table.indices + extra.indices, table.values + extra.values, extra.limit)
+        _save_table(path, table, complete)
+    table.source = file_hash(file_name)
+    _tables[path] = (table, complete)
+    return table
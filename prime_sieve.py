@@ -0,0 +1,97 @@
+'''
+Segmented sieve of Eratosthenes producing the values of the Von Mangoldt function for zeta
+
+The sieve only keeps the primes up to the square root of the limit and one segment of numbers
+in memory at a time, so Λ(n) can be generated for n up to 10^9 without storing a file of e^Λ(n).
+'''
+import itertools, heapq, math
+from mpmath import iv
+
+SEGMENT = 1 << 18   #numbers sieved at a time
+
+
+def small_primes(limit):
+    '''
+    Function to find all primes up to limit with an ordinary sieve of Eratosthenes
+    '''
+    if limit < 2:
+        return []
+    sieve = bytearray([1]) * (limit + 1)
+    sieve[0] = sieve[1] = 0
+    for p in range(2, math.isqrt(limit) + 1):
+        if sieve[p]:
+            sieve[p * p::p] = bytes(len(range(p * p, limit + 1, p)))
+    return list(itertools.compress(range(limit + 1), sieve))
+
+def segments(limit, size=SEGMENT):
+    '''
+    Generator yielding the primes up to limit, one increasing list per segment of the sieve
+
+    output: tuples of the start of the segment, the end of the segment and the primes in [start, end)
+    '''
+    base = small_primes(math.isqrt(limit))
+    blank = bytes(size)
+    for low in range(2, limit + 1, size):
+        high = min(low + size, limit + 1)
+        sieve = bytearray([1]) * (high - low)
+        for p in base:
+            if p * p >= high:
+                break
+            start = max(p * p, ((low + p - 1) // p) * p)
+            if start < high:
+                count = len(range(start, high, p))
+                sieve[start - low::p] = blank[:count]
+        yield low, high, list(itertools.compress(range(low, high), sieve))
+
+def prime_powers(limit, size=SEGMENT):
+    '''
+    Generator yielding (n, p) in increasing order for every prime power n = p^k <= limit
+    '''
+    #higher powers only come from primes up to the square root of the limit
+    powers = []
+    for p in small_primes(math.isqrt(limit)):
+        n = p * p
+        while n <= limit:
+            powers.append((n, p))
+            n *= p
+    powers.sort()
+    position = 0
+    for low, high, primes in segments(limit, size):
+        start = position
+        while position < len(powers) and powers[position][0] < high:
+            position += 1
+        yield from heapq.merge(((p, p) for p in primes), powers[start:position])
+
+
+class RiemannLambda:
+    '''
+    Source of the nonzero values Λ(n) = log p for n = p^k, which can be passed to von_mangoldt_term
+    in place of a file of e^Λ(n) for the Riemann zeta function
+
+    The logarithms of the primes below the square root of the largest N used are remembered,
+    since those primes also give the higher prime powers.
+    '''
+    source = "riemann-sieve"    #identifies these values in the cache of sum_cache
+
+    def __init__(self):
+        self.logs = {}
+        self.prec = iv.prec
+
+    def log(self, p, limit):
+        #logarithms found at a different precision are thrown away
+        if self.prec != iv.prec:
+            self.logs = {}
+            self.prec = iv.prec
+        if p in self.logs:
+            return self.logs[p]
+        value = iv.log(iv.mpf(p))
+        if p * p <= limit:
+            self.logs[p] = value
+        return value
+
+    def terms(self, N):
+        '''
+        Generator yielding (n, Λ(n)) for the nonzero terms with n <= N
+        '''
+        for n, p in prime_powers(N):
+            yield n, self.log(p, N)
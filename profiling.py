@@ -0,0 +1,73 @@
+'''
+Timing and counters for the stages of the verification program, turned on with --profile
+
+Nothing is recorded until enable is called. The stages are timed by replacing functions with
+wrappers in instrument, so the functions are not changed at all when profiling is off, and count
+returns straight away. Times are inclusive, so the time of find_sum contains the time of
+von_mangoldt_term. Only the main process is measured, work done in a pool of processes is counted
+in the time of the function that started the pool.
+'''
+import atexit, functools, json, sys, time
+
+ENABLED = False
+times = {}      #name of each stage to [calls, seconds]
+counters = {}
+
+
+def count(name, amount=1):
+    '''
+    Function to add to a counter, does nothing when profiling is off
+    '''
+    if ENABLED:
+        counters[name] = counters.get(name, 0) + amount
+
+def _timed(name, function):
+    '''
+    Internal function to wrap a function so the calls and the time spent in it are recorded
+    '''
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        begin = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            entry = times.setdefault(name, [0, 0.0])
+            entry[0] += 1
+            entry[1] += time.perf_counter() - begin
+    return wrapper
+
+def instrument(module, names, prefix=""):
+    '''
+    Function to time the functions of a module with the given names, calls through the module's
+    globals are timed, including calls from inside the module
+    '''
+    for name in names:
+        setattr(module, name, _timed(prefix + name, getattr(module, name)))
+
+def summary():
+    '''
+    Function to collect the times and counters
+
+    output: dictionary with the stages sorted by their total time and the counters
+    '''
+    stages = {}
+    for name, (calls, seconds) in sorted(times.items(), key=lambda item: -item[1][1]):
+        stages[name] = {"calls": calls, "seconds": round(seconds, 6)}
+    return {"stages": stages, "counters": dict(sorted(counters.items()))}
+
+def enable(output=None):
+    '''
+    Function to start recording, the summary is written as JSON when the program exits
+
+        output: name of a file for the summary, None to write it to standard error
+    '''
+    global ENABLED
+    ENABLED = True
+    def write():
+        text = json.dumps(summary(), indent=1)
+        if output == None:
+            print(text, file=sys.stderr)
+        else:
+            with open(output, "w") as file:
+                file.write(text + "\n")
+    atexit.register(write)
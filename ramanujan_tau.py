@@ -0,0 +1,136 @@
+'''
+Values of the Ramanujan tau function and the Λ(n) used for its L-function
+
+τ(n) is found from the q-expansion Δ = q * (η^3)^8, where η^3 = Σ (-1)^k (2k + 1) q^(k(k + 1)/2)
+has very few nonzero terms. The three squarings are done with Kronecker substitution: each
+polynomial is evaluated at a large power of 10 and the products are computed exactly by the
+decimal module, which multiplies very large numbers with a number theoretic transform.
+
+With t = τ(p)/p^(11/2) = α + β and αβ = 1, the coefficients of -L'/L are Λ(p^k) = (α^k + β^k) log p,
+which follow from the Hecke recursion c_k = t * c_(k-1) - c_(k-2) with c_0 = 2 and c_1 = t.
+'''
+from decimal import Decimal, Context, localcontext, MAX_PREC, MAX_EMAX, MIN_EMIN, ROUND_FLOOR
+from mpmath import iv
+from prime_sieve import prime_powers, small_primes
+
+
+def _pack(coefficients, width, length):
+    '''
+    Internal function to evaluate a polynomial with nonnegative coefficients at 10^width
+
+        coefficients: dictionary from degree to coefficient
+        length: number of blocks of digits, larger than the highest degree
+    '''
+    digits = bytearray(b"0" * (width * length))
+    for degree, value in coefficients.items():
+        text = str(value).encode()
+        end = width * (length - degree)
+        digits[end - len(text):end] = text
+    return Decimal(digits.decode())
+
+def _truncate(value, width, length):
+    '''
+    Internal function to drop the terms of degree length and higher from a polynomial evaluated at
+    X = 10^width, keeping the balanced representation where every coefficient is less than X/2 in size
+    '''
+    shift = width * length
+    high = value.scaleb(-shift).to_integral_value(rounding=ROUND_FLOOR)
+    value = value - high.scaleb(shift)
+    modulus = Decimal(1).scaleb(shift)
+    if value >= modulus / 2:
+        value = value - modulus
+    return value
+
+def _unpack(value, width, length, degrees):
+    '''
+    Internal function to read coefficients back from a polynomial evaluated at X = 10^width
+
+        degrees: set of degrees to return, all other coefficients are skipped
+
+    output: dictionary from degree to coefficient
+    '''
+    sign = 1
+    if value < 0:
+        sign = -1
+        value = -value
+    text = format(value, "f").rjust(width * length, "0")
+    base = 10 ** width
+    half = base // 2
+    carry = 0
+    coefficients = {}
+    for degree in range(length):
+        end = len(text) - width * degree
+        block = int(text[end - width:end]) + carry
+        carry = 0
+        if block >= half:
+            block -= base
+            carry = 1
+        if degree in degrees:
+            coefficients[degree] = sign * block
+    return coefficients
+
+
+def tau_at_primes(N):
+    '''
+    Function to find τ(p) for every prime p <= N
+
+    output: dictionary from each prime to τ(p)
+    '''
+    length = N     #Δ/q is needed up to degree N - 1
+    positive = {}
+    negative = {}
+    k = 0
+    while k * (k + 1) // 2 < length:
+        if k % 2 == 0:
+            positive[k * (k + 1) // 2] = 2 * k + 1
+        else:
+            negative[k * (k + 1) // 2] = 2 * k + 1
+        k += 1
+    #every coefficient of the powers of η^3 is bounded by the number of ways to write the degree as a sum
+    #of 8 triangular numbers times the largest possible product of 8 coefficients
+    bound = k ** 7 * (2 * k + 1) ** 8
+    width = len(str(bound)) + 1
+    primes = small_primes(N)
+    context = Context(prec=MAX_PREC, Emax=MAX_EMAX, Emin=MIN_EMIN)
+    with localcontext(context):
+        value = _pack(positive, width, length) - _pack(negative, width, length)
+        for i in range(3):
+            value = _truncate(value * value, width, length)
+        coefficients = _unpack(value, width, length, set(p - 1 for p in primes))
+    return {p: coefficients[p - 1] for p in primes}
+
+
+class RamanujanLambda:
+    '''
+    Source of the nonzero values Λ(n) for the L-function of the Ramanujan tau function, normalized
+    the same way as Lambda_Values/Ramanujan_Lambdas.txt at the primes, which can be passed to
+    von_mangoldt_term in place of that file
+
+    The values of τ(p) are kept, so a later call with a smaller N does not recompute them.
+    '''
+    source = "ramanujan-q-expansion"    #identifies these values in the cache of sum_cache
+
+    def __init__(self):
+        self.tau = {}
+        self.limit = 0
+
+    def terms(self, N):
+        '''
+        Generator yielding (n, Λ(n)) for the nonzero terms with n <= N
+        '''
+        if N > self.limit:
+            self.tau = tau_at_primes(N)
+            self.limit = N
+        power = iv.mpf("11/2")
+        recursion = {}      #last two values of c_k for primes that have higher powers below N
+        for n, p in prime_powers(N):
+            if n == p:
+                t = iv.mpf(self.tau[p]) / (iv.mpf(p) ** power)
+                c = [iv.mpf("2"), t]
+                if p * p <= N:
+                    recursion[p] = (t, c)
+            else:
+                t, c = recursion[p]
+                c = [c[1], (t * c[1]) - c[0]]
+                recursion[p] = (t, c)
+            yield n, c[1] * iv.log(iv.mpf(p))
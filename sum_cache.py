@@ -0,0 +1,98 @@
+'''
+Cache on disk of the intervals found by find_sum
+
+The sum over all zeros found by find_sum does not depend on τ, on the list of zeros or on the type
+of verification, so it is stored in an SQLite database in the cache directory of lambda_values. The
+key holds the function, the expansion point, N, the conductor, the source of the Lambda values (the
+hash of the file for a Lambda file) and the working precision. The endpoints of each interval are
+stored exactly as a mantissa and an exponent, and the least recently used entries are removed when
+there are more than LIMIT of them.
+'''
+import os, sqlite3, time
+from mpmath import iv
+from mpmath.libmp import from_man_exp, finf, fninf, fnan
+
+FILE_NAME = "find_sum.sqlite"
+LIMIT = 100000      #number of entries kept
+ENABLED = True
+
+_connections = {}
+
+
+def _connect(cache_dir):
+    '''
+    Internal function to open the database in a directory, each process opens its own connection
+
+    output: the connection, or None if the database cannot be opened, for example because the
+    directory is not writable, in which case the sums are found again every time
+    '''
+    path = os.path.join(cache_dir, FILE_NAME)
+    key = (path, os.getpid())
+    if key not in _connections:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            connection = sqlite3.connect(path, timeout=60)
+            connection.execute("CREATE TABLE IF NOT EXISTS sums (key TEXT PRIMARY KEY, lower_man TEXT, lower_exp INTEGER, upper_man TEXT, upper_exp INTEGER, used REAL)")
+            connection.execute("CREATE INDEX IF NOT EXISTS sums_used ON sums (used)")
+            connection.commit()
+        except (OSError, sqlite3.Error):
+            connection = None
+        _connections[key] = connection
+    return _connections[key]
+
+def make_key(function, x, y, N, d, source, prec):
+    '''
+    Function to build the key of a sum
+
+    inputs:
+        function - name of the function
+        x, y - strings, the expansion point as it was given
+        N - number of terms in the sum over primes
+        d - fundamental discriminant, None if not applicable
+        source - string identifying the Lambda values, see the source attribute of LambdaTable
+        prec - working precision in bits
+    '''
+    return "|".join(str(part) for part in [function, x, y, N, d, source, prec])
+
+def get(key, cache_dir):
+    '''
+    Function to find a stored interval, marking it as recently used
+
+    output: the interval, or None if it is not stored
+    '''
+    connection = _connect(cache_dir)
+    if connection == None:
+        return None
+    try:
+        row = connection.execute("SELECT lower_man, lower_exp, upper_man, upper_exp FROM sums WHERE key = ?", (key,)).fetchone()
+        if row == None:
+            return None
+        connection.execute("UPDATE sums SET used = ? WHERE key = ?", (time.time(), key))
+        connection.commit()
+    except sqlite3.Error:
+        return None
+    return iv.make_mpf((from_man_exp(int(row[0]), row[1]), from_man_exp(int(row[2]), row[3])))
+
+def put(key, value, cache_dir):
+    '''
+    Function to store an interval, removing the least recently used entries beyond LIMIT
+    '''
+    endpoints = []
+    for raw in value._mpi_:
+        #infinite endpoints cannot be written as a mantissa and an exponent
+        if raw in [finf, fninf, fnan]:
+            return
+        sign, man, exp, bc = raw
+        endpoints += [str(-man if sign else man), exp]
+    connection = _connect(cache_dir)
+    if connection == None:
+        return
+    #a sum that cannot be stored is only found again next time
+    try:
+        connection.execute("INSERT OR REPLACE INTO sums VALUES (?, ?, ?, ?, ?, ?)", (key, *endpoints, time.time()))
+        extra = connection.execute("SELECT COUNT(*) FROM sums").fetchone()[0] - LIMIT
+        if extra > 0:
+            connection.execute("DELETE FROM sums WHERE key IN (SELECT key FROM sums ORDER BY used LIMIT ?)", (extra,))
+        connection.commit()
+    except sqlite3.Error:
+        connection.rollback()
@@ -108,4 +108,105 @@ def R(x, y, tau):
     val = (iv.mpf("1") - (iv.mpf("2") * x))/(iv.mpf("2") * iv.pi * tau)
     val = val * iv.log(y/(iv.mpf("2") * iv.pi))
     val = val + B(x, y, tau)
-    return val
\ No newline at end of file
+    return val
+
+#r and R for a list of (x, y, τ) points, returned as a list of (r, R) pairs in the same order
+#the parts depending only on x, y or τ are found once for each distinct value and shared by r and R
+def _key(value):
+    return value._mpi_ if hasattr(value, "_mpi_") else value
+
+def tail_bounds_many(points):
+    two = iv.mpf("2")
+    two_pi = two * iv.pi
+    factor = iv.mpf("0.006") * iv.mpf("4") * (iv.pi ** two)
+    xs = {}
+    ys = {}
+    taus = {}
+    pairs = {}
+    results = []
+    for x, y, tau in points:
+        if _key(x) not in xs:
+            u = iv.mpf(x)
+            s = iv.mpf("1") - (two * u)
+            xs[_key(x)] = (s, (iv.mpf("1") - u) ** two, iv.mpf("2") - (iv.mpf("4") * u), iv.mpf("4") - (iv.mpf("8") * u))
+        if _key(y) not in ys:
+            v = iv.mpf(y)
+            c = v / two
+            twice = two * v
+            half = v - c
+            g6 = (twice - c) ** two * iv.log(twice - c) - (half ** two) * iv.log(half)
+            g6 = g6 / (iv.pi * (half ** two))
+            ys[_key(y)] = (v, c, half, twice, iv.log(v / two_pi), iv.log(twice / c), l(twice), l1(twice), g6)
+        if _key(tau) not in taus:
+            t = iv.mpf(tau)
+            taus[_key(tau)] = (t, t ** two, t ** iv.mpf("3"))
+        s, square, shift2, shift4 = xs[_key(x)]
+        v, c, half, twice, log_y, log_e2, l_y, l1_y, g6 = ys[_key(y)]
+        t, t2, t3 = taus[_key(tau)]
+        if (_key(y), _key(tau)) not in pairs:
+            pairs[(_key(y), _key(tau))] = (iv.mpf("1") / (c ** two) + iv.mpf("1") / ((v + t) ** two)) * factor
+        val1 = pairs[(_key(y), _key(tau))]
+        val2 = (s / twice) * log_e2
+        val3 = (square / (iv.mpf("3") * t3) + iv.mpf("1") / half) * s
+        val4 = (shift2 / t2 + shift2 / (half ** two)) * l_y
+        val5 = (shift4 / t3) * l1_y
+        val6 = g6 * (s / twice)
+        shared = (s / t) * val1 + val2
+        both = (val4 + val5) / two
+        lower = (shared + val3 * log_y) / two_pi + both
+        upper = shared / two_pi + both + val6
+        main = (s / (two_pi * t)) * log_y
+        results.append((main - lower, main + upper))
+    return results
+
+def tail_bounds(x, y, tau):
+    return tail_bounds_many([(x, y, tau)])[0]
+
+
+#bounds on the zeros above τ for the L-functions expanded around a real point x, with conductor q and the
+#shifts μ_j of the gamma factors Γ_R(s + μ_j), so each zero 1/2 + iγ with γ > 0 contributes (1 - 2x)/((1/2 - x)^2 + γ^2)
+#the number N(t) of zeros with |γ| <= t is taken to satisfy |N(t) - (t/π) log(q (t/2πe)^d)| <= E(t) for t >= 1, where
+#d is the number of shifts and E(t) = COUNT_LOG log(q Π_j (t + 2 + μ_j)) + COUNT_CONSTANT d
+#the defaults are above the published explicit bounds for Dirichlet L-functions and Dedekind zeta functions
+COUNT_LOG = "0.5"
+COUNT_CONSTANT = "7"
+
+def _between(low, high):
+    return iv.mpf([low.a, high.b])
+
+def general_tail_bounds_many(points, conductor, shifts, count_log=COUNT_LOG, count_constant=COUNT_CONSTANT):
+    two = iv.mpf("2")
+    q = iv.mpf(conductor)
+    d = iv.mpf(len(shifts))
+    c1 = iv.mpf(count_log)
+    c2 = iv.mpf(count_constant)
+    results = []
+    for x, y, tau in points:
+        t = iv.mpf(tau)
+        #the count of zeros is only bounded above t = 1, so only the trivial bounds are known below
+        if t.a < 1:
+            results.append((iv.mpf("0"), iv.mpf([0, "inf"])))
+            continue
+        u = iv.mpf(x)
+        s = iv.mpf("1") - (two * u)
+        a2 = (iv.mpf("1/2") - u) ** two
+        log_t = iv.log(t)
+        #1/t^2 - a^2/t^4 <= 1/(a^2 + t^2) <= 1/t^2 bounds the integrals of 1/(a^2 + t^2) and log(t)/(a^2 + t^2) from τ
+        i0 = _between(iv.mpf("1")/t - a2/(iv.mpf("3") * t ** 3), iv.mpf("1")/t)
+        i1 = _between((log_t + 1)/t - a2 * (iv.mpf("3") * log_t + 1)/(iv.mpf("9") * t ** 3), (log_t + 1)/t)
+        #integral of the main term of the count against the contribution, from τ
+        main = (s/iv.pi) * ((iv.log(q) - d * iv.log(two * iv.pi)) * i0 + d * i1)
+        error = c1 * iv.log(q)
+        for shift in shifts:
+            error = error + c1 * iv.log(t + 2 + iv.mpf(shift))
+        error = error + c2 * d
+        edge = two * error * s/(a2 + t ** 2)
+        growth = c1 * d * s/(two * t ** 2)
+        lower = (main - edge - growth)/two
+        #every zero adds a positive amount, so the tail is never negative
+        lower = iv.mpf([max(lower.a, 0), max(lower.b, 0)])
+        results.append((lower, (main + edge + growth)/two))
+    return results
+
+def general_tail_bounds(x, tau, conductor, shifts):
+    return general_tail_bounds_many([(x, "0", tau)], conductor, shifts)[0]
@@ -0,0 +1,39 @@
+import os, sys
+from mpmath import iv
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+import lambda_values, sum_cache
+
+RAMANUJAN_LAMBDAS = os.path.join(ROOT, "Lambda_Values", "Ramanujan_Lambdas.txt")
+
+
+def unwritable(tmp_path):
+    #a directory below a plain file can never be created, even by root
+    (tmp_path / "file").write_text("")
+    return str(tmp_path / "file" / "cache")
+
+def test_lambda_cache(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    table = lambda_values.cached_lambda(RAMANUJAN_LAMBDAS, 100, False, cache_dir)
+    lambda_values._tables.clear()
+    cached = lambda_values.cached_lambda(RAMANUJAN_LAMBDAS, 100, False, cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+    assert cached.indices == table.indices and cached.limit == table.limit == 100
+
+def test_lambda_cache_not_writable(tmp_path):
+    table = lambda_values.cached_lambda(RAMANUJAN_LAMBDAS, 100, False, unwritable(tmp_path))
+    assert table.limit == 100
+    assert table.indices == lambda_values.read_lambda(RAMANUJAN_LAMBDAS, 100, False).indices
+
+def test_sum_cache(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    value = iv.mpf(["0.25", "0.5"])
+    sum_cache.put("key", value, cache_dir)
+    assert sum_cache.get("key", cache_dir) == value
+    assert sum_cache.get("other", cache_dir) == None
+
+def test_sum_cache_not_writable(tmp_path):
+    cache_dir = unwritable(tmp_path)
+    sum_cache.put("key", iv.mpf("1"), cache_dir)
+    assert sum_cache.get("key", cache_dir) == None
@@ -0,0 +1,75 @@
+import os, sys
+import pytest
+from mpmath import iv
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+import general_verification as gv
+from lambda_values import read_lambda
+from ramanujan_tau import RamanujanLambda
+
+RAMANUJAN_LAMBDAS = os.path.join(ROOT, "Lambda_Values", "Ramanujan_Lambdas.txt")
+
+
+def test_ramanujan_sieve():
+    #a new RamanujanLambda has not computed any τ(p) yet, which must not be taken for a short table
+    value = gv.von_mangoldt_term(200, "-10", "0", gv.Function.RAMANUJAN, RamanujanLambda())
+    assert value.real.b - value.real.a < 1e-15
+    #the generated values agree with the file at the primes
+    table = read_lambda(RAMANUJAN_LAMBDAS, 200, False)
+    generated = dict(RamanujanLambda().terms(200))
+    for n, expected in zip(table.indices, table.values):
+        if n in [2, 3, 5, 7, 11, 13, 197, 199]:
+            assert generated[n].a <= expected.b and expected.a <= generated[n].b
+
+def test_short_table_exits():
+    table = read_lambda(RAMANUJAN_LAMBDAS, 50, False)
+    with pytest.raises(SystemExit, match="only go up to n = 50"):
+        gv.von_mangoldt_term(100, "-10", "0", gv.Function.RAMANUJAN, table)
+
+@pytest.mark.parametrize("resolution", [0, -1, "-1/4", "step"])
+def test_check_sum_rejects_resolution(resolution):
+    #with a step that is not positive the search for the verified distance would never stop
+    with pytest.raises(SystemExit, match="Invalid resolution"):
+        gv.check_sum(iv.mpf("0"), iv.mpf("1"), "-10", "0", "10", gv.Function.RAMANUJAN, gv.Verification.RIEMANN_HYPOTHESIS, resolution=resolution)
+
+def test_check_sum_resolution():
+    distance, decided = gv.check_sum(iv.mpf("0"), iv.mpf("0.01"), "-10", "0", "10", gv.Function.RAMANUJAN, gv.Verification.RIEMANN_HYPOTHESIS, resolution="1/4")
+    assert distance > 0 and (distance * 4).denominator == 1
+
+@pytest.mark.parametrize("x, y", [("0", "10"), ("0.5", "0"), ("-10", "-1")])
+def test_check_expansion_point(x, y):
+    with pytest.raises(SystemExit, match="Inappropriate expansion point"):
+        gv.check_expansion_point(x, y)
+
+def test_numpy_engine_without_numpy(monkeypatch):
+    monkeypatch.setattr(gv.fast_sum, "np", None)
+    zeros = [iv.mpf("9.22237939992110252224")]
+    for find in [gv.sum_over, gv.zero_terms]:
+        with pytest.raises(SystemExit, match="NumPy could not be imported"):
+            find(zeros, "-10", "0", gv.Function.RAMANUJAN, "numpy")
+
+def test_check_with_fallback():
+    pytest.importorskip("numpy")
+    #an enclosure too wide to decide the result is found again with mpmath
+    engines = []
+    def base_sum(engine):
+        engines.append(engine)
+        return iv.mpf(["-1", "0.001"]) if engine == "numpy" else iv.mpf("0")
+    args = (iv.mpf("0.01"), "-10", "0", "10", gv.Function.RAMANUJAN, gv.Verification.RIEMANN_HYPOTHESIS)
+    result = gv.check_with_fallback(base_sum, "numpy", *args)
+    assert engines == ["numpy", "mpmath"] and result == gv.check_sum(iv.mpf("0"), *args)
+
+def test_ramanujan_tail_needs_count_bound(monkeypatch):
+    monkeypatch.setattr(gv, "COUNT_BOUND", None)
+    with pytest.raises(SystemExit, match="--count_bound"):
+        gv.find_tail_bounds([("-10", "0", "100")], gv.Function.RAMANUJAN)
+
+def test_ramanujan_tail(monkeypatch):
+    monkeypatch.setattr(gv, "COUNT_BOUND", ["1/2", "7"])
+    assert gv.gamma_factors(gv.Function.RAMANUJAN) == (1, ["11/2", "13/2"])
+    lower, upper = gv.find_tail_bounds([("-10", "0", "100")], gv.Function.RAMANUJAN)[0]
+    assert 0 < lower.a and lower.b < upper.a
+    #the zeros in the file above τ are part of the tail, so they cannot add up to more than the upper bound
+    zeros = [zero for zero in gv.read_zeros(os.path.join(ROOT, "zeros", "Ramanujan_zeros.txt"), 0) if zero.a > 100]
+    assert gv.sum_over(zeros, "-10", "0", gv.Function.RAMANUJAN).b < upper.a
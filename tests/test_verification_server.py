@@ -0,0 +1,85 @@
+import asyncio, os, sys, threading, time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from mpmath import iv
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import verification_server
+from verification_server import Client, RequestError
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    '''
+    Runs the server on a Unix socket in a background thread, with a pool of threads in place of the
+    worker processes so run_request can be replaced by the tests, and with the caches on disk turned off
+    '''
+    monkeypatch.setattr(verification_server.lambda_values, "CACHE_DIR", None)
+    path = str(tmp_path / "zeta.sock")
+    pool = ThreadPoolExecutor(max_workers=2)
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    asyncio.run_coroutine_threadsafe(verification_server.serve(pool, path), loop)
+    for i in range(100):
+        if os.path.exists(path):
+            break
+        time.sleep(0.05)
+    yield path
+    asyncio.run_coroutine_threadsafe(_stop(), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+    pool.shutdown()
+
+async def _stop():
+    tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+def test_unexpected_error_is_answered(server, monkeypatch):
+    def failing(method, params):
+        return {"result": [1, 2][params["index"]]}
+    monkeypatch.setattr(verification_server, "run_request", failing)
+    with Client(server, timeout=10) as client:
+        with pytest.raises(RequestError, match="IndexError: list index out of range"):
+            client.request("ping", index=5)
+        #the connection still works after the failed request
+        assert client.request("ping", index=1) == 2
+
+def test_error_inside_request_is_answered(server, monkeypatch):
+    def failing(zeros, *args, **kwargs):
+        return 1 / len(zeros)
+    monkeypatch.setattr(verification_server.gv, "verify", failing)
+    monkeypatch.setitem(verification_server._datasets["zeros"], "empty", [])
+    with Client(server, timeout=10) as client:
+        with pytest.raises(RequestError, match="ZeroDivisionError"):
+            client.verify(zeros="empty", sieve=10, function="riemann", x="2", tau="1")
+
+def test_client_timeout(server, monkeypatch):
+    def slow(method, params):
+        time.sleep(2)
+        return {"result": None}
+    monkeypatch.setattr(verification_server, "run_request", slow)
+    client = Client(server, timeout=0.2)
+    with pytest.raises(RequestError, match="No answer"):
+        client.request("ping")
+
+@pytest.mark.parametrize("resolution", [0, -1, "1/0"])
+def test_invalid_resolution_is_answered(server, monkeypatch, resolution):
+    #a resolution of 0 used to make the worker search for the verified distance forever
+    monkeypatch.setitem(verification_server._datasets["zeros"], "empty", [])
+    with Client(server, timeout=10) as client:
+        with pytest.raises(RequestError, match="Invalid resolution"):
+            client.verify(zeros="empty", sieve=10, function="ramanujan", x="-10", tau="10", resolution=resolution)
+        assert client.request("ping") == os.getpid()
+
+def test_ramanujan_sieve_request(server, monkeypatch):
+    #the values of τ(p) are only found when the request is run, which used to be taken for an empty table
+    monkeypatch.setattr(verification_server.gv, "digamma_term", lambda *args: iv.mpf("0"))
+    with Client(server, timeout=60) as client:
+        result = client.find_sum(sieve=100, function="ramanujan", x="-10")
+        assert float(result["real"][0]) <= float(result["real"][1])
+        with pytest.raises(RequestError, match="Unknown zero dataset"):
+            client.verify(zeros="missing", sieve=100, function="ramanujan", x="-10", tau="10")
@@ -0,0 +1,370 @@
+'''
+Long-running verification service that keeps lists of zeros and Lambda values in memory
+
+Starting general_verification.py for every query means importing mpmath, reading the files of zeros
+and Lambda values and finding the digamma values again each time. The server reads the named datasets
+given on the command line once, then answers requests on a Unix socket or a localhost TCP port. Each
+request is a line of JSON and each answer is a line of JSON with the same id, for example
+    {"id": 1, "method": "verify", "params": {"zeros": "ramanujan", "lambda": "ramanujan", "function": "ramanujan", "x": "-10", "y": "0", "N": 99999, "tau": "10000"}}
+    {"id": 1, "result": {"distance": 85, "incomplete": false}}
+
+Requests are run on a pool of processes forked after the datasets are read, so every worker shares
+them and keeps its own digamma values, Lambda tables and sum cache connection warm between requests.
+Several requests, from one connection or many, run at the same time. The Client class sends requests
+from Python.
+
+Example:
+    python verification_server.py --socket /tmp/zeta.sock --zeros ramanujan zeros/Ramanujan_zeros.txt 0 --lambda ramanujan ramanujan Lambda_Values/Ramanujan_Lambdas.txt 99999
+'''
+import argparse, asyncio, json, multiprocessing, os, socket, sys
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal, localcontext
+from fractions import Fraction
+from mpmath import iv
+from mpmath.libmp import finf, fninf
+import general_verification as gv
+import lambda_values
+import sum_cache
+from zero_store import ZeroStore, read_zero_list, read_hiary_zero_list
+
+FUNCTIONS = {"riemann": gv.Function.RIEMANN, "dirichlet": gv.Function.REAL_DIRICHLET, "ramanujan": gv.Function.RAMANUJAN}
+VERIFICATIONS = {"rh": gv.Verification.RIEMANN_HYPOTHESIS, "completeness": gv.Verification.COMPLETENESS}
+DPS = 40    #working precision used when a request does not give one
+TIMEOUT = 3600  #seconds the Client waits for an answer by default
+
+_datasets = {"zeros": {}, "lambda": {}}
+
+
+class RequestError(Exception):
+    '''
+    Error in a request, sent back to the client instead of stopping the server
+    '''
+
+
+def load_zeros(name, kind, values, compact=False):
+    '''
+    Function to read a list of zeros into the datasets of the server
+
+    inputs:
+        name - name used by requests
+        kind - "zeros" for a file of ordinates and a column, "hiary" for Hiary's format with a start
+            and a number of lines, "store" for a binary zero store
+        values - list of strings given on the command line
+        compact - True to keep text files in arrays of floats, see zero_store.ZeroList
+    '''
+    if kind == "zeros":
+        zeros = read_zero_list(values[0], int(values[1])) if compact else gv.read_zeros(values[0], int(values[1]))
+    elif kind == "hiary":
+        zeros = read_hiary_zero_list(values[1], values[0], int(values[2])) if compact else gv.read_hiary_zeros(values[1], values[0], int(values[2]))
+    else:
+        zeros = ZeroStore(values[0])
+    _datasets["zeros"][name] = zeros
+    return len(zeros)
+
+def load_lambda(name, function, file_name, N):
+    '''
+    Function to read the Lambda values of a file into the datasets of the server, the values are
+    read for the given function because files for zeta hold e^Λ(n) instead of Λ(n)
+    '''
+    if function not in FUNCTIONS:
+        sys.exit("Unknown function " + function + ", please use one of " + ", ".join(FUNCTIONS) + ".")
+    table = gv.load_lambda(file_name, N, FUNCTIONS[function])
+    #sums found from the table are cached under the hash of the file
+    if table.source == None:
+        table.source = lambda_values.file_hash(file_name)
+    _datasets["lambda"][name] = (FUNCTIONS[function], table, N)
+    return len(table)
+
+
+def _get(params, key, default=None):
+    '''
+    Internal function to read a parameter of a request, raising RequestError when a required one is missing
+    '''
+    if key in params:
+        return params[key]
+    if default == None:
+        raise RequestError("Missing parameter " + key)
+    return default
+
+def _source(params, function):
+    '''
+    Internal function to find the Lambda values and N for a request, either a dataset named by
+    "lambda" or the values generated by the sieve when "sieve" gives N
+    '''
+    if "lambda" in params:
+        if params["lambda"] not in _datasets["lambda"]:
+            raise RequestError("Unknown Lambda dataset " + str(params["lambda"]))
+        kind, table, N = _datasets["lambda"][params["lambda"]]
+        if kind.value != function.value and gv.Function.RIEMANN in [kind, function]:
+            raise RequestError("The Lambda dataset " + params["lambda"] + " was read for a different function")
+        N = int(params.get("N", N))
+        if N > table.limit:
+            raise RequestError("The Lambda dataset " + params["lambda"] + " only has " + str(table.limit) + " terms")
+        return table, N
+    if "sieve" in params:
+        if function == gv.Function.RIEMANN:
+            return gv.RiemannLambda(), int(params["sieve"])
+        elif function == gv.Function.RAMANUJAN:
+            return gv.RamanujanLambda(), int(params["sieve"])
+        return gv.DirichletLambda(int(_get(params, "d"))), int(params["sieve"])
+    raise RequestError("Missing parameter lambda or sieve")
+
+def _discriminant(params):
+    return int(params["d"]) if params.get("d") != None else None
+
+def _function(params):
+    name = _get(params, "function")
+    if name not in FUNCTIONS:
+        raise RequestError("Unknown function " + str(name))
+    return FUNCTIONS[name]
+
+def _endpoints(value):
+    '''
+    Internal function to write the endpoints of an interval as exact decimal strings
+    '''
+    result = []
+    for raw in value._mpi_:
+        if raw == finf:
+            result.append("inf")
+        elif raw == fninf:
+            result.append("-inf")
+        else:
+            sign, man, exp, bc = raw
+            with localcontext() as context:
+                context.prec = bc + abs(exp) + 10
+                number = Decimal(-man if sign else man) * Decimal(2) ** exp
+            result.append(format(number, "f"))
+    return result
+
+
+def run_request(method, params):
+    '''
+    Function run by the worker processes to answer one request
+
+    output: dictionary with the result, or with the error when the request failed
+    '''
+    try:
+        iv.dps = int(params.get("dps", DPS))
+        if method == "verify":
+            function = _function(params)
+            if params.get("zeros") not in _datasets["zeros"]:
+                raise RequestError("Unknown zero dataset " + str(params.get("zeros")))
+            source, N = _source(params, function)
+            verification = VERIFICATIONS.get(params.get("verification", "rh"))
+            if verification == None:
+                raise RequestError("Unknown verification " + str(params["verification"]))
+            try:
+                resolution = Fraction(params.get("resolution", 1))
+            except ZeroDivisionError:
+                resolution = 0
+            #check_sum would exit for these, but the request is rejected before any sums are found
+            if resolution <= 0:
+                raise RequestError("Invalid resolution " + str(params["resolution"]) + ", the step must be positive")
+            val = gv.verify(_datasets["zeros"][params["zeros"]], str(_get(params, "x")), str(_get(params, "y", "0")), N, str(_get(params, "tau")),
+                function, source, verification, bool(params.get("tail", False)), _discriminant(params), params.get("engine", "mpmath"), resolution=resolution)
+            return {"result": {"distance": val if not isinstance(val, Fraction) else str(val), "incomplete": val == None}}
+        elif method == "find_sum":
+            function = _function(params)
+            source, N = _source(params, function)
+            value = gv.find_sum(str(_get(params, "x")), str(_get(params, "y", "0")), N, function, _discriminant(params), source)
+            result = {"real": _endpoints(value.real)}
+            if hasattr(value, "imag"):
+                result["imag"] = _endpoints(value.imag)
+            return {"result": result}
+        elif method == "datasets":
+            zeros = {name: len(zeros) for name, zeros in _datasets["zeros"].items()}
+            tables = {name: {"function": kind.name.lower(), "N": N} for name, (kind, table, N) in _datasets["lambda"].items()}
+            return {"result": {"zeros": zeros, "lambda": tables}}
+        elif method == "ping":
+            return {"result": os.getpid()}
+        raise RequestError("Unknown method " + str(method))
+    except (RequestError, SystemExit, ValueError, TypeError) as error:
+        return {"error": str(error)}
+    except Exception as error:
+        return {"error": _describe(error)}
+
+def _describe(error):
+    '''
+    Internal function to describe an error that was not expected, so the client is told what went wrong
+    '''
+    return type(error).__name__ + ": " + str(error)
+
+def _worker_ready():
+    return os.getpid()
+
+
+async def handle(reader, writer, pool):
+    '''
+    Function to answer the requests sent on one connection, each request is run as soon as its line
+    is read and the answers are written in the order they finish
+    '''
+    loop = asyncio.get_running_loop()
+    lock = asyncio.Lock()
+    tasks = set()
+    async def answer(line):
+        try:
+            request = json.loads(line)
+            method, params = request.get("method"), request.get("params", {})
+        except (ValueError, AttributeError) as error:
+            response = {"id": None, "error": "Invalid request: " + str(error)}
+        else:
+            #every request gets an answer, even when the worker itself fails, so the client never waits forever
+            try:
+                response = await loop.run_in_executor(pool, run_request, method, params)
+            except Exception as error:
+                response = {"error": _describe(error)}
+            response["id"] = request.get("id")
+        async with lock:
+            writer.write((json.dumps(response, default=str) + "\n").encode())
+            await writer.drain()
+    try:
+        while True:
+            line = await reader.readline()
+            if line == b"":
+                break
+            if line.strip() == b"":
+                continue
+            task = asyncio.create_task(answer(line))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if len(tasks) > 0:
+            await asyncio.gather(*tasks)
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+async def serve(pool, path=None, host="127.0.0.1", port=None):
+    '''
+    Function to run the server until it is stopped
+    '''
+    if path != None:
+        if os.path.exists(path):
+            os.remove(path)
+        server = await asyncio.start_unix_server(lambda reader, writer: handle(reader, writer, pool), path)
+        print("Listening on", path, flush=True)
+    else:
+        server = await asyncio.start_server(lambda reader, writer: handle(reader, writer, pool), host, port)
+        print("Listening on", host + ":" + str(port), flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+class Client:
+    '''
+    Python interface to a running server
+
+        path: Unix socket of the server, or None to connect to host and port
+        timeout: seconds to wait for each answer before giving up, or None to wait as long as it takes
+
+    The parameters of a request are given as keywords, with Lambda in place of lambda, which is a
+    reserved word in Python.
+
+    Example:
+        client = Client("/tmp/zeta.sock")
+        client.verify(zeros="ramanujan", Lambda="ramanujan", function="ramanujan", x="-10", tau="10000")
+    '''
+    def __init__(self, path=None, host="127.0.0.1", port=None, timeout=TIMEOUT):
+        if path != None:
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.socket.settimeout(timeout)
+            self.socket.connect(path)
+        else:
+            self.socket = socket.create_connection((host, port), timeout)
+        self.timeout = timeout
+        self.file = self.socket.makefile("rwb")
+        self.next_id = 0
+
+    def request(self, method, **params):
+        '''
+        Function to send a request and wait for its answer
+
+        output: the result, raises RequestError if the server could not answer the request or no answer
+            came within the timeout, after which the connection is closed
+        '''
+        self.next_id += 1
+        if "Lambda" in params:
+            params["lambda"] = params.pop("Lambda")
+        self.file.write((json.dumps({"id": self.next_id, "method": method, "params": params}) + "\n").encode())
+        self.file.flush()
+        try:
+            line = self.file.readline()
+        except TimeoutError:
+            #the rest of a late answer could still arrive, so the connection cannot be used again
+            self.close()
+            raise RequestError("No answer from the server after " + str(self.timeout) + " seconds")
+        if line == b"":
+            raise RequestError("The server closed the connection")
+        response = json.loads(line)
+        if "error" in response:
+            raise RequestError(response["error"])
+        return response["result"]
+
+    def verify(self, **params):
+        return self.request("verify", **params)
+
+    def find_sum(self, **params):
+        return self.request("find_sum", **params)
+
+    def datasets(self):
+        return self.request("datasets")
+
+    def close(self):
+        self.file.close()
+        self.socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *error):
+        self.close()
+
+
+def main():
+    global DPS
+    parser = argparse.ArgumentParser(description="Program to answer verify and find_sum requests as JSON, keeping lists of zeros and Lambda values in memory between requests.")
+    parser.add_argument("--socket", help="Unix socket to listen on", metavar="PATH")
+    parser.add_argument("--port", type=int, help="localhost TCP port to listen on, used when no socket is given")
+    parser.add_argument("--host", default="127.0.0.1", help="address for --port, default is 127.0.0.1")
+    parser.add_argument("--zeros", nargs=3, action="append", default=[], help="file of zero ordinates, can be given many times", metavar=("NAME", "FILE_NAME", "COLUMN"))
+    parser.add_argument("--hiary", nargs=4, action="append", default=[], help="file of zero ordinates created by Dr. Ghaith Hiary", metavar=("NAME", "FILE_NAME", "START", "LINES"))
+    parser.add_argument("--store", nargs=2, action="append", default=[], help="binary zero store created by zero_store.py", metavar=("NAME", "FILE_NAME"))
+    parser.add_argument("--lambda", dest="Lambda", nargs=4, action="append", default=[], help="file of Lambda values for a function (riemann, dirichlet or ramanujan)", metavar=("NAME", "FUNCTION", "FILE_NAME", "N"))
+    parser.add_argument("--compact", action="store_true", help="keep the zeros from text files in arrays of floats, see zero_store.py")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes, defaults to the number of processors")
+    parser.add_argument("--dps", type=int, default=DPS, help="working precision in decimal digits used when a request does not give one")
+    parser.add_argument("--cache_dir", help="directory for the caches of Lambda values and sums, by default ~/.cache/zeta_function_project or ZETA_CACHE_DIR, see lambda_values.py")
+    parser.add_argument("--no_cache", action="store_true", help="do not read or write anything in the cache directory")
+    args = parser.parse_args()
+    if args.socket == None and args.port == None:
+        sys.exit("No socket or port given, please try again.")
+    DPS = args.dps
+    iv.dps = DPS
+    if args.cache_dir != None:
+        lambda_values.CACHE_DIR = args.cache_dir
+    if args.no_cache:
+        lambda_values.CACHE_DIR = None
+        sum_cache.ENABLED = False
+    for name, file_name, column in args.zeros:
+        print("Read", load_zeros(name, "zeros", [file_name, column], args.compact), "zeros into", name, flush=True)
+    for name, file_name, start, lines in args.hiary:
+        print("Read", load_zeros(name, "hiary", [file_name, start, lines], args.compact), "zeros into", name, flush=True)
+    for name, file_name in args.store:
+        print("Opened", load_zeros(name, "store", [file_name]), "zeros as", name, flush=True)
+    for name, function, file_name, N in args.Lambda:
+        print("Read", load_lambda(name, function, file_name, int(N)), "Lambda values into", name, flush=True)
+    #the workers are forked before the event loop starts so they share the datasets read above
+    workers = args.workers if args.workers != None else os.cpu_count()
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork"), initializer=gv._worker_start)
+    for future in [pool.submit(_worker_ready) for i in range(workers)]:
+        future.result()
+    try:
+        asyncio.run(serve(pool, args.socket, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.shutdown()
+        if args.socket != None and os.path.exists(args.socket):
+            os.remove(args.socket)
+if __name__ == "__main__":
+    main()
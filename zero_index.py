@@ -0,0 +1,170 @@
+'''
+Sidecar indexes for reading only a window of a sorted text file of zeros
+
+An index holds a checkpoint every STEP lines with the ordinate on that line, its byte offset and its
+line number. It is written next to the text file with the extension .idx, together with the size and
+modification time of the file, and is built again when either of them changes. With the index the
+reader seeks to the checkpoint before the window and parses lines until it passes the window, so
+only a few kilobytes of a large file are read to verify at one height.
+
+The lines are parsed the same way as read_zeros and read_hiary_zeros, so the zeros in a window are
+the same intervals those functions create.
+
+Block files written by block_file.py carry their own index with the first ordinate of every block,
+so no sidecar is written for them and only the blocks around the window are decompressed.
+'''
+import bisect, math, os, struct, sys
+from mpmath import iv
+import block_file
+
+MAGIC = b"ZEROIDX1"
+HEADER = struct.Struct("<QQqQQ")    #size, modification time, column (-1 for Hiary's format), step and number of checkpoints
+CHECKPOINT = struct.Struct("<dQQ")  #ordinate, byte offset and line number
+STEP = 1024     #lines between checkpoints
+
+_indexes = {}
+
+
+def _ordinate(words, column):
+    '''
+    Internal function to find the ordinate on a line as a string, None for lines without one
+
+        column: column of the ordinate, None for the format found on Dr. Ghaith Hiary's webpage
+    '''
+    if column == None:
+        if len(words) > 1:
+            return words[0] + words[1][1:]
+        return None
+    if len(words) > column:
+        return words[column]
+    return None
+
+def index_path(file_name):
+    return file_name + ".idx"
+
+def build_index(file_name, column, step=STEP):
+    '''
+    Function to find the checkpoints of a text file of zeros
+
+    output: list of (ordinate, byte offset, line number) tuples, the ordinate is rounded down
+    '''
+    checkpoints = []
+    previous = None
+    offset = 0
+    with open(file_name, "rb") as file:
+        for number, line in enumerate(file):
+            word = _ordinate(line.split(), column)
+            if word != None:
+                value = float(word)
+                if previous != None and value < previous:
+                    sys.exit("The zeros in " + file_name + " are not sorted, so it cannot be indexed.")
+                previous = value
+                if len(checkpoints) == 0 or number - checkpoints[-1][2] >= step:
+                    checkpoints.append((math.nextafter(value, -math.inf), offset, number))
+            offset += len(line)
+    return checkpoints
+
+def load_index(file_name, column, step=STEP):
+    '''
+    Function to read the index of a file, building it and writing it next to the file if it is
+    missing or the file has changed since it was built
+
+    output: list of checkpoints, see build_index
+    '''
+    info = os.stat(file_name)
+    key = (os.path.abspath(file_name), info.st_size, info.st_mtime_ns, column)
+    if key in _indexes:
+        return _indexes[key]
+    header = (info.st_size, info.st_mtime_ns, -1 if column == None else column, step)
+    checkpoints = None
+    path = index_path(file_name)
+    if os.path.exists(path):
+        with open(path, "rb") as file:
+            data = file.read()
+        if data[:len(MAGIC)] == MAGIC and HEADER.unpack_from(data, len(MAGIC))[:4] == header:
+            count = HEADER.unpack_from(data, len(MAGIC))[4]
+            start = len(MAGIC) + HEADER.size
+            checkpoints = [CHECKPOINT.unpack_from(data, start + i * CHECKPOINT.size) for i in range(count)]
+    if checkpoints == None:
+        checkpoints = build_index(file_name, column, step)
+        data = MAGIC + HEADER.pack(*header, len(checkpoints)) + b"".join(CHECKPOINT.pack(*checkpoint) for checkpoint in checkpoints)
+        #an index that cannot be saved is still used for this run
+        try:
+            temp = path + "." + str(os.getpid())
+            with open(temp, "wb") as file:
+                file.write(data)
+            os.replace(temp, path)
+        except OSError:
+            pass
+    _indexes[key] = checkpoints
+    return checkpoints
+
+def iter_window(file_name, column, low, high, error="1e-8", start="0", lines=None):
+    '''
+    Generator yielding the zero intervals of a sorted text file from just below low to just above high
+
+    inputs:
+        file_name - name of the text file
+        column - column of the ordinates, None for the format found on Dr. Ghaith Hiary's webpage
+        low, high - floats, the ends of the window relative to start
+        error - radius added to every nonzero ordinate
+        start - value added to every zero, for Hiary's files
+        lines - number of lines of the file that may be used, None for the whole file
+
+    The first zero yielded is below low and the last one is above high unless the file ends, so
+    zero_window finds the same zeros in the result as in the whole list.
+    '''
+    if block_file.is_block_file(file_name):
+        source = block_file.BlockFile(file_name)
+        if source.column != (block_file.HIARY if column == None else column):
+            source.close()
+            sys.exit("The ordinates in the index of " + file_name + " are not in the column being read, please convert it again.")
+        #start at the last block below the window so the zero below the window is included
+        position = source.find_ordinate(low)
+        number = source.entries[position][2] if len(source.entries) > 0 else 0
+        file = source.lines(position)
+    else:
+        checkpoints = load_index(file_name, column)
+        if len(checkpoints) == 0:
+            return
+        #start at the last checkpoint below the window so the zero below the window is included
+        position = max(bisect.bisect_left([checkpoint[0] for checkpoint in checkpoints], low) - 1, 0)
+        ordinate, offset, number = checkpoints[position]
+        source = open(file_name, "rb")
+        source.seek(offset)
+        file = source
+    error = iv.mpf(error)
+    start = iv.mpf(start)
+    with source:
+        below = None
+        for line in file:
+            if lines != None and number >= lines:
+                break
+            number += 1
+            word = _ordinate(line.split(), column)
+            if word == None:
+                continue
+            ordinate = iv.mpf(word.decode())
+            zero = ordinate
+            if column == None or zero != iv.mpf("0"):
+                zero = iv.mpf([zero.a - error, zero.b + error])
+            if column == None:
+                zero = zero + start
+            #keep only the last zero below the window
+            if ordinate.b < low:
+                below = zero
+                continue
+            if below != None:
+                yield below
+                below = None
+            yield zero
+            if ordinate.a > high:
+                break
+        if below != None:
+            yield below
+
+def read_window(file_name, column, low, high, error="1e-8", start="0", lines=None):
+    '''
+    Function to read the zeros of a sorted text file around a window into a list, see iter_window
+    '''
+    return list(iter_window(file_name, column, low, high, error, start, lines))
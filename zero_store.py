@@ -0,0 +1,269 @@
+'''
+Compact binary files for lists of zeros
+
+A zero store holds the lower and upper endpoints of every zero interval as 64-bit floats,
+sorted in increasing order, after a short header recording the error radius that was applied,
+the shift that has to be added back to every endpoint, and the format of the original text file.
+The endpoints are rounded outwards when they are written, so every stored interval contains the
+interval that read_zeros or read_hiary_zeros would have built from the same line.
+
+Opening a store only memory-maps the file. Intervals are created for the zeros inside a window
+when they are needed, so the size of the list no longer matters when verifying at one height.
+A ZeroList holds the same arrays in memory, read straight from a text file without writing a store.
+'''
+import argparse, bisect, json, math, mmap, struct, sys
+from array import array
+from decimal import Decimal
+from mpmath import iv
+import block_file
+
+MAGIC = b"ZEROSTR1"
+HEADER = struct.Struct("<QQ")   #number of zeros and length of the json text that follows
+
+
+def _round_down(value):
+    '''
+    Internal function to find the largest float that is less than or equal to a Decimal
+    '''
+    num = float(value)
+    if Decimal(num) > value:
+        num = math.nextafter(num, -math.inf)
+    return num
+
+def _round_up(value):
+    '''
+    Internal function to find the smallest float that is greater than or equal to a Decimal
+    '''
+    num = float(value)
+    if Decimal(num) < value:
+        num = math.nextafter(num, math.inf)
+    return num
+
+
+def parse_zeros(file_name, index, error="1e-8"):
+    '''
+    Generator matching read_zeros, yields the endpoints of each zero interval as floats
+
+        file_name: name of a text file with zero ordinates in columns
+        index: column holding the ordinates
+        error: radius added to every nonzero ordinate
+    '''
+    error = Decimal(error)
+    with block_file.open_text(file_name) as file:
+        for line in file:
+            words = line.split()
+            if len(words) <= index:
+                continue
+            zero = Decimal(words[index])
+            #zeros at the origin are exact and are not padded
+            if zero == 0:
+                yield 0.0, 0.0
+            else:
+                yield _round_down(zero - error), _round_up(zero + error)
+
+def parse_hiary_zeros(file_name, lines=None, error="1e-10"):
+    '''
+    Generator matching read_hiary_zeros, yields the endpoints of each zero interval as floats
+    without adding the starting value, which is stored separately
+
+        file_name: name of a file using the format found on Dr. Ghaith Hiary's webpage
+        lines: number of lines to read, None to read the whole file
+        error: radius added to every ordinate, taken from Dr. Hiary's webpage
+    '''
+    error = Decimal(error)
+    with block_file.open_text(file_name) as file:
+        for j, line in enumerate(file):
+            if lines is not None and j >= lines:
+                break
+            words = line.split()
+            if len(words) > 1:
+                zero = Decimal(words[0] + words[1][1:])
+                yield _round_down(zero - error), _round_up(zero + error)
+
+
+def sorted_arrays(endpoints):
+    '''
+    Function to sort the endpoints of the zero intervals into arrays of floats
+
+    output: arrays of the lower and the upper endpoints
+    '''
+    pairs = sorted(endpoints)
+    lower = array("d", [pair[0] for pair in pairs])
+    upper = array("d", [pair[1] for pair in pairs])
+    #the window search needs the upper endpoints to be sorted as well
+    for i in range(1, len(upper)):
+        if upper[i] < upper[i - 1]:
+            sys.exit("Zero intervals are nested and cannot be stored, please check the input file.")
+    return lower, upper
+
+def write_store(output, endpoints, error, shift="0", source="zeros"):
+    '''
+    Function to write a zero store
+
+    inputs:
+        output - name of the binary file to create
+        endpoints - iterable of (lower, upper) pairs of floats
+        error - string, error radius that was applied to the endpoints
+        shift - string, value to add to every endpoint, a power of 10 for Hiary's files
+        source - format of the original text file
+
+    output: number of zeros written
+    '''
+    lower, upper = sorted_arrays(endpoints)
+    if sys.byteorder != "little":
+        lower.byteswap()
+        upper.byteswap()
+    text = json.dumps({"error": error, "shift": shift, "source": source}).encode()
+    #pad the header so the arrays start on an 8 byte boundary
+    text = text + b" " * (-(len(MAGIC) + HEADER.size + len(text)) % 8)
+    with open(output, "wb") as file:
+        file.write(MAGIC)
+        file.write(HEADER.pack(len(lower), len(text)))
+        file.write(text)
+        lower.tofile(file)
+        upper.tofile(file)
+    return len(lower)
+
+
+class ZeroView:
+    '''
+    Sequence of zeros backed by arrays of lower and upper endpoints relative to a shift
+
+    Indexing with an integer returns the zero as an interval, indexing with a slice returns
+    another view of the same arrays without copying them.
+    '''
+    def __init__(self, lower, upper, offset):
+        self.lower = lower
+        self.upper = upper
+        self.offset = offset
+
+    def __len__(self):
+        return len(self.lower)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return ZeroView(self.lower[i], self.upper[i], self.offset)
+        return iv.mpf([self.lower[i], self.upper[i]]) + self.offset
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def bounds(self, value):
+        '''
+        Internal function to turn an interval into float bounds relative to the shift
+        '''
+        value = iv.mpf(value) - self.offset
+        return math.nextafter(float(value.a), -math.inf), math.nextafter(float(value.b), math.inf)
+
+    def position(self, value):
+        '''
+        Function to find how many zeros lie below a value
+
+        Exits if one of the zero intervals overlaps the value, the same way find_closest_index
+        does when an expansion point is inside a zero.
+        '''
+        lower, upper = self.bounds(value)
+        below = bisect.bisect_left(self.upper, lower)    #zeros that are certainly below the value
+        not_above = bisect.bisect_right(self.lower, upper)   #zeros that might be below the value
+        if below != not_above:
+            sys.exit("Invalid expansion point, please try again")
+        return below
+
+    def window(self, lower_val, upper_val):
+        '''
+        Function to find the zeros strictly between two values
+
+        inputs: lower_val, upper_val - intervals giving the ends of the window
+
+        output: view of the zeros in the window
+        '''
+        return self[self.position(lower_val):self.position(upper_val)]
+
+
+class ZeroStore(ZeroView):
+    '''
+    Memory-mapped list of zeros read from a file created by write_store
+    '''
+    def __init__(self, file_name):
+        self.file = open(file_name, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.map[:len(MAGIC)] != MAGIC:
+            sys.exit("File is not a zero store, please try again.")
+        count, length = HEADER.unpack_from(self.map, len(MAGIC))
+        start = len(MAGIC) + HEADER.size
+        header = json.loads(self.map[start:start + length].decode())
+        self.error = header["error"]
+        self.shift = header["shift"]
+        self.source = header["source"]
+        start = start + length
+        if sys.byteorder == "little":
+            data = memoryview(self.map)[start:start + 16 * count].cast("d")
+        else:
+            data = array("d", self.map[start:start + 16 * count])
+            data.byteswap()
+        ZeroView.__init__(self, data[:count], data[count:], iv.mpf(self.shift))
+
+    def close(self):
+        if isinstance(self.lower, memoryview):
+            self.lower.release()
+            self.upper.release()
+        self.map.close()
+        self.file.close()
+
+
+class ZeroList(ZeroView):
+    '''
+    List of zeros held in memory as arrays of lower and upper endpoints
+
+    Each zero takes 16 bytes instead of a whole interval, and slices and windows are views of the
+    same arrays, so only the zeros that are used are turned into intervals.
+
+    inputs:
+        endpoints - iterable of (lower, upper) pairs of floats, see parse_zeros and parse_hiary_zeros
+        error - string, error radius that was applied to the endpoints
+        shift - string, value to add to every endpoint, a power of 10 for Hiary's files
+        source - format of the text file
+    '''
+    def __init__(self, endpoints, error, shift="0", source="zeros"):
+        lower, upper = sorted_arrays(endpoints)
+        self.error = error
+        self.shift = shift
+        self.source = source
+        #slices of a memoryview share the array instead of copying it
+        ZeroView.__init__(self, memoryview(lower), memoryview(upper), iv.mpf(shift))
+
+def read_zero_list(file_name, index):
+    '''
+    Function to read a text file of zeros into a ZeroList, with the same zeros as read_zeros
+    '''
+    return ZeroList(parse_zeros(file_name, index), "1e-8")
+
+def read_hiary_zero_list(start, file_name, lines):
+    '''
+    Function to read a file in the format found on Dr. Ghaith Hiary's webpage into a ZeroList,
+    with the same zeros as read_hiary_zeros
+    '''
+    return ZeroList(parse_hiary_zeros(file_name, lines), "1e-10", start, "hiary")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Program to convert a text file of zero ordinates into a binary zero store that can be used with the -b option of general_verification.py")
+    parser.add_argument("output", help="name of the binary file to create")
+    parser.add_argument("-H", "--H_zeros", nargs=3, help="use file of zero ordinates created by Dr. Ghaith Hiary, LINES can be 0 to read the whole file", metavar=("FILENAME", "SHIFT", "LINES"))
+    parser.add_argument("-z", "--zeros", nargs=2, help="use file of zero ordinates", metavar=("FILE_NAME", "COLUMN"))
+    args = parser.parse_args()
+    if args.zeros != None and args.H_zeros != None:
+        sys.exit("Too many zero files. Please try again and provide one file with all zero ordinates.")
+    elif args.zeros != None:
+        count = write_store(args.output, parse_zeros(args.zeros[0], int(args.zeros[1])), "1e-8")
+    elif args.H_zeros != None:
+        lines = int(args.H_zeros[2])
+        if lines == 0:
+            lines = None
+        count = write_store(args.output, parse_hiary_zeros(args.H_zeros[0], lines), "1e-10", args.H_zeros[1], "hiary")
+    else:
+        sys.exit("No files with zero ordinates provided, please try again")
+    print("Wrote", count, "zeros to", args.output)
+if __name__ == "__main__":
+    main()